@@ -1,2 +1,9 @@
 from . import controllers
-from . import models
\ No newline at end of file
+from . import models
+from . import wizard
+
+
+def post_init_hook(env):
+    # Working days without a summary row count as absences: build the rows of
+    # the attendance history recorded before the module was installed
+    env['attendance.day.summary']._backfill(auto_commit=True)
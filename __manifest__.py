@@ -1,24 +1,39 @@
 {
     'name': 'AGB Communication Attendance Dashboard',
-    'version': '1.0.0',
+    'version': '1.0.1',
     'description': 'Employee Attendance Dashboard for AGB Communication Myanmar',
     'author': 'AGB Communication',
     'website': 'https://agbcommunication.com',
     'category': 'Human Resources',
-    'depends': ['base', 'hr', 'hr_attendance'],
+    'depends': ['base', 'bus', 'hr', 'hr_attendance'],
     'data': [
         'security/ir.model.access.csv',
+        'data/employee_login_data.xml',
+        'data/attendance_day_summary_data.xml',
+        'data/attendance_export_data.xml',
+        'data/attendance_month_rollup_data.xml',
         'views/attendance_dashboard_templates.xml',
         'views/register_template.xml',
+        'wizard/employee_login_provision_views.xml',
     ],
     'assets': {
-        'web.assets_frontend': [
+        # The portal pages render their own <head> and load only these bundles
+        'attendance_dashboard.assets_portal': [
             'attendance_dashboard/static/src/css/attendance_dashboard.css',
             'attendance_dashboard/static/src/js/attendance_dashboard.js',
+        ],
+        # Fetched by attendance_dashboard.js once the page is idle
+        'attendance_dashboard.assets_portal_lazy': [
+            'attendance_dashboard/static/src/js/lazy/day_details.js',
+            'attendance_dashboard/static/src/js/lazy/notification.js',
+            'attendance_dashboard/static/src/js/lazy/pull_to_refresh.js',
+        ],
+        'attendance_dashboard.assets_register': [
             'attendance_dashboard/static/src/css/register.css',
             'attendance_dashboard/static/src/js/register.js',
         ],
     },
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'auto_install': False,
     'application': True,
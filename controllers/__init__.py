@@ -1,2 +1,4 @@
 from . import dashboard
-from . import register
\ No newline at end of file
+from . import register
+from . import api
+from . import export
\ No newline at end of file
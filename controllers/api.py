@@ -0,0 +1,278 @@
+from odoo import fields, http
+from odoo.http import request
+from odoo.tools import date_utils
+from datetime import date, timedelta
+import calendar
+import hashlib
+import json
+import logging
+
+from .dashboard import AttendanceDashboardController
+from .profiling import profiled
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the JSON payload shape changes so clients drop their cached copies
+API_VERSION = 1
+
+# Rows written by transactions still running when a sync cursor was issued get
+# an earlier write date than the cursor: each sync looks back this much further
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+class AttendanceApiController(AttendanceDashboardController):
+    """Compact JSON endpoints for the mobile app, with ETag / 304 support."""
+
+    # --- Summary Stats ---
+    @http.route('/attendance/api/stats', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_stats(self, **kwargs):
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        start_date, end_date = self._get_fiscal_period()
+        etag = self._make_etag('stats', employee, start_date.date(), end_date.date())
+        if self._etag_matches(etag):
+            return self._not_modified(etag)
+
+        return self._json_response({
+            'employee': {'id': employee.id, 'name': employee.name},
+            'period': {'start': start_date.date(), 'end': end_date.date()},
+            'stats': self._calculate_stats(employee, start_date, end_date),
+        }, etag)
+
+    # --- Calendar Month ---
+    @http.route('/attendance/api/calendar', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_calendar(self, year=None, month=None, **kwargs):
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        today = self._now_myanmar()
+        year_month = self._parse_year_month(year, month)
+        if not year_month:
+            return self._json_response({'error': 'bad_request'}, status=400)
+        year, month = year_month
+        _, num_days = calendar.monthrange(year, month)
+
+        etag = self._make_etag('calendar', employee, date(year, month, 1), date(year, month, num_days))
+        if self._etag_matches(etag):
+            return self._not_modified(etag)
+
+        calendar_data = self._get_calendar_data(employee, year, month)
+        return self._json_response({
+            'year': year,
+            'month': month,
+            'month_name': calendar.month_name[month],
+            'prev_month': self._get_prev_month(year, month),
+            'next_month': self._get_next_month(year, month),
+            'today': today.date(),
+            'fiscal_start': self._get_fiscal_period()[0].date(),
+            'days': list(calendar_data.values()),
+        }, etag)
+
+    # --- Absent List ---
+    @http.route('/attendance/api/absent', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_absent(self, before=None, limit=None, **kwargs):
+        """
+        The full absent list, or one page of it when ``limit`` is given:
+        ``before`` takes the ``next_cursor`` of the previous page.
+        """
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        start_date, end_date = self._get_fiscal_period()
+        kind = 'absent' if limit is None else f'absent:{before}:{limit}'
+        etag = self._make_etag(kind, employee, start_date.date(), end_date.date())
+        if self._etag_matches(etag):
+            return self._not_modified(etag)
+
+        if limit is not None:
+            page = self._get_absent_page(employee, self._parse_date_cursor(before), self._page_limit(limit))
+            totals = self._get_period_totals(employee)
+            return self._json_response({
+                'absent_days': page['entries'],
+                'next_cursor': page['next_cursor'],
+                'total_absent': totals['absentDays'],
+            }, etag)
+
+        absent_days = self._get_absent_days(employee)
+        return self._json_response({
+            'absent_days': absent_days,
+            'total_absent': len(absent_days),
+        }, etag)
+
+    # --- Late List ---
+    @http.route('/attendance/api/late', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_late(self, before=None, limit=None, **kwargs):
+        """
+        The full late list, or one page of it when ``limit`` is given:
+        ``before`` takes the ``next_cursor`` of the previous page.
+        """
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        start_date, end_date = self._get_fiscal_period()
+        kind = 'late' if limit is None else f'late:{before}:{limit}'
+        etag = self._make_etag(kind, employee, start_date.date(), end_date.date())
+        if self._etag_matches(etag):
+            return self._not_modified(etag)
+
+        if limit is not None:
+            page = self._get_late_page(employee, self._parse_datetime_cursor(before), self._page_limit(limit))
+            totals = self._get_period_totals(employee)
+            return self._json_response({
+                'late_days': page['entries'],
+                'next_cursor': page['next_cursor'],
+                'total_late_days': totals['lateCount'],
+                'total_late_minutes': totals['lateMinutes'],
+                'avg_lateness': totals['lateMinutes'] / totals['lateCount'] if totals['lateCount'] else 0,
+            }, etag)
+
+        late_days, total_late_minutes, avg_lateness = self._get_late_days(employee)
+        return self._json_response({
+            'late_days': late_days,
+            'total_late_days': len(late_days),
+            'total_late_minutes': total_late_minutes,
+            'avg_lateness': avg_lateness,
+        }, etag)
+
+    # --- Team Totals ---
+    @http.route('/attendance/api/team', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_team(self, department_id=None, **kwargs):
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        team = self._get_team(employee, department_id)
+        if team is None:
+            return self._json_response({'error': 'forbidden'}, status=403)
+        title, members = team
+
+        start_date, end_date = self._get_fiscal_period()
+        team_stats = self._get_team_stats(members, start_date, end_date)
+        return self._json_response({
+            'team': title,
+            'period': {'start': start_date.date(), 'end': end_date.date()},
+            'totals': team_stats['totals'],
+            'members': team_stats['members'],
+        })
+
+    # --- Delta Sync ---
+    @http.route('/attendance/api/sync', type='http', auth='public', methods=['GET'])
+    @profiled
+    def api_sync(self, since=None, **kwargs):
+        """
+        Calendar days changed since a sync cursor, with the current stats.
+
+        Without a usable ``since`` (first sync, new fiscal period, calendar or
+        employee change) the whole period up to the end of the current month is
+        returned with ``reset`` set, and the client replaces its store.
+        """
+        employee = self._get_employee()
+        if not employee:
+            return self._json_unauthorized()
+
+        synced_at = fields.Datetime.now()
+        start_date, end_date = self._get_fiscal_period()
+        first_day, today = start_date.date(), end_date.date()
+        month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        fingerprint = self._get_sync_fingerprint(employee, first_day)
+
+        cursor = self._parse_sync_cursor(since)
+        reset = not cursor or cursor['fingerprint'] != fingerprint or cursor['today'] > today
+        if reset:
+            dates = self._date_range(first_day, month_end)
+        else:
+            changed = request.env['attendance.day.summary'].sudo().search_read([
+                ('employee_id', '=', employee.id),
+                ('date', '>=', first_day),
+                ('date', '<=', month_end),
+                ('write_date', '>=', cursor['since'] - SYNC_OVERLAP),
+            ], ['date'])
+            dates = {row['date'] for row in changed}
+            if cursor['today'] != today:
+                # Days move from future to past as time goes by, without any write
+                dates.update(self._date_range(max(cursor['today'], first_day), month_end))
+            dates = sorted(dates)
+
+        return self._json_response({
+            'cursor': '|'.join((fields.Datetime.to_string(synced_at), today.isoformat(), fingerprint)),
+            'reset': reset,
+            'fiscal_start': first_day,
+            'today': today,
+            'days': self._get_calendar_days(employee, dates),
+            'stats': self._calculate_stats(employee, start_date, end_date),
+        })
+
+    # --- Helper Methods ---
+    def _get_sync_fingerprint(self, employee, first_day):
+        """Fingerprint of everything besides the summary rows that the synced days depend on."""
+        schedule = request.env['attendance.day.summary'].sudo()._get_schedule(employee)
+        raw = repr((API_VERSION, first_day, employee.write_date, [
+            (rules['two_weeks'], sorted(rules['hours'].items()), sorted(rules['start'].items()), sorted(rules['holidays']))
+            for rules in schedule.compiled_rules
+        ]))
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def _parse_sync_cursor(self, value):
+        """Return the parts of a cursor issued by ``api_sync``, or None when missing or malformed."""
+        try:
+            since, today, fingerprint = (value or '').split('|')
+            return {
+                'since': fields.Datetime.to_datetime(since),
+                'today': fields.Date.to_date(today),
+                'fingerprint': fingerprint,
+            }
+        except ValueError:
+            return None
+
+    def _date_range(self, first_day, last_day):
+        return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+    def _make_etag(self, kind, employee, first_day, last_day):
+        """
+        Build a strong ETag from the employee's summary stamp over the range.
+
+        The stamp changes whenever one of the employee's attendances in the range
+        is written, and the current day is included because "today" drives the
+        absent and future-day classification. The employee's own write date
+        covers shift changes shown in the calendar.
+        """
+        stamp = request.env['attendance.day.summary'].sudo()._get_employee_stamp(employee.id, first_day, last_day)
+        raw = '|'.join(str(part) for part in (
+            API_VERSION, kind, employee.id, employee.write_date, first_day, last_day, self._now_myanmar().date(), stamp,
+        ))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _etag_matches(self, etag):
+        return request.httprequest.if_none_match.contains(etag)
+
+    def _etag_headers(self, etag):
+        return [
+            ('ETag', '"%s"' % etag),
+            ('Cache-Control', 'private, no-cache'),
+        ]
+
+    def _not_modified(self, etag):
+        return request.make_response('', headers=self._etag_headers(etag), status=304)
+
+    def _json_response(self, payload, etag=None, status=200):
+        headers = [('Content-Type', 'application/json')]
+        if etag:
+            headers += self._etag_headers(etag)
+        return request.make_response(
+            json.dumps(payload, default=date_utils.json_default),
+            headers=headers,
+            status=status,
+        )
+
+    def _json_unauthorized(self):
+        return self._json_response({'error': 'unauthorized'}, status=401)
@@ -1,15 +1,29 @@
-from odoo import http
+from odoo import fields, http
 from odoo.http import request
+from odoo.tools.misc import file_open
 from datetime import datetime, timedelta, date
 import pytz
 import calendar
+import json
 import logging
-from dateutil.relativedelta import relativedelta
+from urllib.parse import urlencode
+
+from ..models.attendance_day_summary import fiscal_period_start
+from ..models.stats_cache import stats_cache
+from .profiling import profiled, timed
 
 _logger = logging.getLogger(__name__)
 
 MYANMAR_TZ = pytz.timezone('Asia/Yangon')
 
+# Cards per page of the absent and late lists, and the most a client may ask for
+DETAILS_PAGE_SIZE = 30
+DETAILS_MAX_PAGE_SIZE = 100
+# Days of summaries loaded per query while walking back for absent days
+ABSENT_PAGE_WINDOW_DAYS = 62
+
+SERVICE_WORKER_PATH = 'attendance_dashboard/static/src/js/attendance_sw.js'
+
 
 class AttendanceDashboardController(http.Controller):
 
@@ -20,48 +34,30 @@ class AttendanceDashboardController(http.Controller):
     def _get_fiscal_period(self):
         """Return start_date and end_date based on fiscal year starting July 26"""
         today = self._now_myanmar()
-        start = today.replace(month=8, day=29, hour=0, minute=0, second=0, microsecond=0)
-
-        if today < start:
-            start_date = start.replace(year=today.year - 1)
-        else:
-            start_date = start.replace(year=today.year)
+        start = fiscal_period_start(today.date())
+        start_date = today.replace(
+            year=start.year, month=start.month, day=start.day, hour=0, minute=0, second=0, microsecond=0)
 
         return start_date, today
 
     # --- Dashboard Route ---
     @http.route('/attendance/dashboard', type='http', auth='public', website=True)
+    @profiled
     def attendance_dashboard(self, **kwargs):
-        # --- Check session first ---
-        employee_id = request.session.get('employee_number')
-
-        # --- Check token from header (for APK) ---
-        if not employee_id and 'X-Employee-Token' in request.httprequest.headers:
-            token = request.httprequest.headers.get('X-Employee-Token')
-            login_record = request.env['employee.login'].sudo().search([('login_token', '=', token)], limit=1)
-            if login_record:
-                employee_id = login_record.employee_number.id
-                request.session['employee_number'] = employee_id  # store in session for future web access
+        employee = self._get_employee()
 
         # --- If no valid login, redirect to login page ---
-        if not employee_id:
+        if not employee:
             return request.redirect('/employee/register')
 
-        employee = request.env['hr.employee'].sudo().browse(employee_id)
-
         start_date, end_date = self._get_fiscal_period()
 
-        attendances = request.env['hr.attendance'].sudo().search([
-            ('employee_id', '=', employee.id),
-            ('check_in', '>=', start_date),
-            ('check_in', '<=', end_date)
-        ])
-
-        stats = self._calculate_stats(employee, attendances, start_date, end_date)
+        stats = self._calculate_stats(employee, start_date, end_date)
 
         return request.render('attendance_dashboard.main_dashboard', {
             'employee': employee,
             'stats': stats,
+            'has_team': bool(employee.child_ids or self._get_team_departments(employee)),
             'current_period': f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}",
             'company_info': {
                 'name': 'AGB Communication',
@@ -74,14 +70,14 @@ class AttendanceDashboardController(http.Controller):
 
     # --- Calendar Route ---
     @http.route('/attendance/calendar', type='http', auth='public', website=True)
+    @profiled
     def attendance_calendar(self, year=None, month=None, **kwargs):
         employee = self._get_employee()
         if not employee:
             return request.redirect('/employee/register')
 
-        today = self._now_myanmar()
-        year = int(year) if year else today.year
-        month = int(month) if month else today.month
+        # A malformed month falls back to the current one
+        year, month = self._parse_year_month(year, month) or self._parse_year_month(None, None)
 
         calendar_data = self._get_calendar_data(employee, year, month)
 
@@ -93,193 +89,457 @@ class AttendanceDashboardController(http.Controller):
             'month_name': calendar.month_name[month],
             'prev_month': self._get_prev_month(year, month),
             'next_month': self._get_next_month(year, month),
+            'fiscal_start': self._get_fiscal_period()[0].date().isoformat(),
         })
 
     # --- Absent Route ---
     @http.route('/attendance/absent', type='http', auth='public', website=True)
-    def absent_details(self, **kwargs):
+    @profiled
+    def absent_details(self, before=None, **kwargs):
         employee = self._get_employee()
         if not employee:
             return request.redirect('/employee/register')
 
-        absent_days = self._get_absent_days(employee)
+        page = self._get_absent_page(employee, self._parse_date_cursor(before))
+        totals = self._get_period_totals(employee)
         return request.render('attendance_dashboard.absent_details', {
             'employee': employee,
-            'absent_days': absent_days,
-            'total_absent': len(absent_days),
+            'absent_days': page['entries'],
+            'next_cursor': page['next_cursor'],
+            'next_url': self._next_page_url('/attendance/absent', page['next_cursor']),
+            'is_first_page': not before,
+            'total_absent': totals['absentDays'],
+            'total_absent_fraction': totals['absentCount'],
             'current_period': f"{self._get_fiscal_period()[0].strftime('%B %d, %Y')} - {self._now_myanmar().strftime('%B %d, %Y')}"
         })
 
     # --- Late Route ---
     @http.route('/attendance/late', type='http', auth='public', website=True)
-    def late_details(self, **kwargs):
+    @profiled
+    def late_details(self, before=None, **kwargs):
         employee = self._get_employee()
         if not employee:
             return request.redirect('/employee/register')
 
-        late_days, total_late_minutes, avg_lateness = self._get_late_days(employee)
+        page = self._get_late_page(employee, self._parse_datetime_cursor(before))
+        totals = self._get_period_totals(employee)
 
         return request.render('attendance_dashboard.late_details', {
             'employee': employee,
-            'late_days': late_days,
-            'total_late_days': len(late_days),
-            'total_late_minutes': total_late_minutes,
-            'avg_lateness': avg_lateness,
+            'late_days': page['entries'],
+            'next_cursor': page['next_cursor'],
+            'next_url': self._next_page_url('/attendance/late', page['next_cursor']),
+            'is_first_page': not before,
+            'total_late_days': totals['lateCount'],
+            'total_late_minutes': totals['lateMinutes'],
+            'avg_lateness': totals['lateMinutes'] / totals['lateCount'] if totals['lateCount'] else 0,
             'current_period': f"{self._get_fiscal_period()[0].strftime('%B %d, %Y')} - {self._now_myanmar().strftime('%B %d, %Y')}"
         })
 
+    # --- Team Route ---
+    @http.route('/attendance/team', type='http', auth='public', website=True)
+    @profiled
+    def team_dashboard(self, department_id=None, **kwargs):
+        employee = self._get_employee()
+        if not employee:
+            return request.redirect('/employee/register')
+
+        team = self._get_team(employee, department_id)
+        if team is None:
+            return request.not_found()
+        title, members = team
+        departments = self._get_team_departments(employee)
+
+        start_date, end_date = self._get_fiscal_period()
+        team_stats = self._get_team_stats(members, start_date, end_date)
+        return request.render('attendance_dashboard.team_dashboard', {
+            'employee': employee,
+            'team_title': title,
+            'has_reports': bool(employee.child_ids),
+            'departments': departments,
+            # Managers without reports land on their first department
+            'department_id': self._parse_department_id(department_id) or (
+                departments[:1].id if not employee.child_ids else None),
+            'members': team_stats['members'],
+            'totals': team_stats['totals'],
+            'current_period': f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}",
+        })
+
     # --- Logout Route ---
     @http.route('/attendance/logout', type='http', auth='public', website=True)
+    @profiled
     def attendance_logout(self, **kwargs):
         request.session.pop('employee_number', None)
-        return request.redirect('/employee/register')
+        request.session.pop('employee_token', None)
+        response = request.redirect('/employee/register')
+        # Drop the offline copies of this employee's pages and synced days
+        response.headers['Clear-Site-Data'] = '"cache", "storage"'
+        return response
+
+    # --- Offline Service Worker ---
+    @http.route('/attendance/sw.js', type='http', auth='public')
+    def attendance_service_worker(self, **kwargs):
+        """Serve the service worker from /attendance/ so that it controls the portal pages."""
+        with file_open(SERVICE_WORKER_PATH, 'rb') as script:
+            return request.make_response(script.read(), headers=[
+                ('Content-Type', 'text/javascript'),
+                ('Cache-Control', 'no-cache'),
+            ])
+
+    # --- Cache Statistics Route ---
+    @http.route('/attendance/cache/stats', type='http', auth='user')
+    @profiled
+    def attendance_cache_stats(self, **kwargs):
+        """
+        Statistics of the stats cache of the worker that answers the request.
+
+        Every worker process has its own cache and counters, identified by the
+        ``pid`` of the payload: under prefork, successive requests may report
+        different workers, and the overall effect is the sum over the workers.
+        """
+        if not request.env.user.has_group('base.group_system'):
+            return request.not_found()
+        return request.make_response(
+            json.dumps(stats_cache.info()),
+            headers={'Content-Type': 'application/json'}
+        )
 
     # --- Helper Methods ---
+    @timed
     def _get_employee(self):
+        """
+        Shared authentication for every route: the web session first, then the
+        ``X-Employee-Token`` header sent by the APK.
+
+        A session opened from a token keeps the token and is only valid as long
+        as the token is, so revoking or expiring it also ends the session.
+        """
+        Login = request.env['employee.login'].sudo()
         employee_id = request.session.get('employee_number')
-        if not employee_id:
-            return None
-        employee = request.env['hr.employee'].sudo().browse(employee_id)
-        if not employee.exists():
+        if employee_id:
+            session_token = request.session.get('employee_token')
+            if session_token:
+                employee = Login._get_employee_by_token(session_token)
+            else:
+                employee = request.env['hr.employee'].sudo().browse(employee_id)
+            if employee.id == employee_id and employee.exists():
+                return employee
             request.session.pop('employee_number', None)
+            request.session.pop('employee_token', None)
+
+        token = request.httprequest.headers.get('X-Employee-Token')
+        if token:
+            employee = Login._get_employee_by_token(token)
+            if employee.exists():
+                # Store in session for future web access
+                request.session['employee_number'] = employee.id
+                request.session['employee_token'] = token
+                return employee
+        return None
+
+    def _get_team_departments(self, employee):
+        """Departments the employee may look at: those they manage and their sub-departments."""
+        Department = request.env['hr.department'].sudo()
+        managed = Department.search([('manager_id', '=', employee.id)])
+        if not managed:
+            return Department
+        return Department.search([('id', 'child_of', managed.ids)], order='complete_name')
+
+    def _parse_department_id(self, department_id):
+        try:
+            return int(department_id) if department_id else None
+        except ValueError:
+            return None
+
+    def _get_team(self, employee, department_id=None):
+        """
+        Return ``(title, members)`` for the team the employee may look at, or None.
+
+        With a department, the employee must manage it or one of its parent
+        departments; otherwise the team is everyone reporting to the employee,
+        or the first managed department for a manager without reports.
+        """
+        Employee = request.env['hr.employee'].sudo()
+        departments = self._get_team_departments(employee)
+        if department_id:
+            department = departments.filtered(lambda dept: dept.id == self._parse_department_id(department_id))
+            if not department:
+                return None
+            return department.name, Employee.search([('department_id', 'child_of', department.id)], order='name')
+
+        members = Employee.search([('id', 'child_of', employee.id), ('id', '!=', employee.id)], order='name')
+        if not members:
+            if departments:
+                return self._get_team(employee, departments[0].id)
             return None
-        return employee
+        return f"Team of {employee.name}", members
+
+    @timed
+    def _get_team_stats(self, members, start_date, end_date):
+        """Per-member and overall totals for a team, aggregated in SQL for all members at once."""
+        totals_by_employee = request.env['attendance.day.summary'].sudo()._get_period_totals(
+            members.ids, start_date.date(), end_date.date(), self._now_myanmar().date())
+
+        rows = []
+        totals = {'attendanceCount': 0.0, 'absentCount': 0.0, 'lateCount': 0, 'lateMinutes': 0}
+        for member in members:
+            member_totals = totals_by_employee[member.id]
+            rows.append(dict(member_totals, id=member.id, name=member.name))
+            for key in totals:
+                totals[key] += member_totals[key]
+        totals['attendanceCount'] = round(totals['attendanceCount'], 1)
+        totals['absentCount'] = round(totals['absentCount'], 1)
+        totals['members'] = len(rows)
+        return {'members': rows, 'totals': totals}
+
+    @timed
+    def _get_period_totals(self, employee):
+        """Fiscal-period totals of one employee from the grouped aggregate, without building any list."""
+        start_date, end_date = self._get_fiscal_period()
+        return request.env['attendance.day.summary'].sudo()._get_period_totals(
+            employee.ids, start_date.date(), end_date.date(), end_date.date())[employee.id]
 
-    def _calculate_stats(self, employee, attendances, start_date, end_date):
+    @timed
+    def _calculate_stats(self, employee, start_date, end_date):
         """
         Calculate attendance statistics for the given employee and date range.
         Handles multi-month periods and filters days strictly within the range.
-        """
-        calendar_data = {}
-
-        # Iterate over all months in the range
-        current = start_date.replace(day=1)
-        while current <= end_date:
-            month_data = self._get_calendar_data(employee, current.year, current.month)
-            # Keep only days within the range
-            for day, data in month_data.items():
-                if start_date.date() <= data['date'] <= end_date.date():
-                    calendar_data[data['date']] = data
-            current += relativedelta(months=1)
-
-        # Total present based on attendance_fraction
-        present_count = sum(day['attendance_fraction'] for day in calendar_data.values())
-
-        # Calculate absent count using absent_fraction from _get_absent_days
-        absent_days = self._get_absent_days(employee)
-        absent_count = sum(
-            day.get('absent_fraction', 0)
-            for day in absent_days
-            if start_date.date() <= day.get('date', date.min) <= end_date.date()
-        )
 
-        # Late count
-        late_count = sum(1 for a in attendances if getattr(a, 'display_late_minutes', 0) > 0)
+        Months precomputed by the nightly rollup job are read as is; only the
+        days after them (normally just today) are computed live.
+        """
+        present_count, absent_count, late_count = 0.0, 0.0, 0
+        live_start = start_date
+
+        rollup = request.env['attendance.month.rollup'].sudo()._get_rollup(
+            employee.id, start_date.date(), end_date.date())
+        if rollup:
+            through, totals = rollup
+            present_count += totals['attendanceCount']
+            absent_count += totals['absentCount']
+            late_count += totals['lateCount']
+            live_start = start_date + timedelta(days=(through - start_date.date()).days + 1)
+
+        if live_start.date() <= end_date.date():
+            period = self._get_period_data(employee, live_start, end_date)
+            present_count += period['present_count']
+            absent_count += period['absent_count']
+            late_count += len(period['late_days'])
 
         # Total days in the period
         total_days = (end_date.date() - start_date.date()).days + 1
 
-        # Round for clean display
-        present_count = round(present_count, 1)
-        absent_count = round(absent_count, 1)
-
         return {
-            'attendanceCount': present_count,
-            'absentCount': absent_count,
+            # Round for clean display
+            'attendanceCount': round(present_count, 1),
+            'absentCount': round(absent_count, 1),
             'lateCount': late_count,
             'total_days': total_days,
         }
 
+    @timed
+    def _get_period_data(self, employee, start_date, end_date):
+        """
+        Return ``_compute_period`` for the employee, served from the per-employee
+        stats cache when the employee's summaries have not changed since.
+        """
+        first_day, last_day = start_date.date(), end_date.date()
+        key = (request.env.cr.dbname, employee.id, first_day, last_day)
+        stamp = request.env['attendance.day.summary'].sudo()._get_employee_stamp(employee.id, first_day, last_day)
+        period = stats_cache.get(key, stamp)
+        if period is None:
+            period = self._compute_period(employee, start_date, end_date)
+            stats_cache.set(key, stamp, period)
+        return period
+
+    @timed
+    def _compute_period(self, employee, start_date, end_date):
+        """
+        Stats engine shared by the dashboard, absent and late pages.
+
+        Reads the pre-aggregated ``attendance.day.summary`` rows of the period with
+        one query and walks the days once to collect present fractions and absent
+        days; late arrivals come from one ordered query on the stored
+        ``late_minutes``.
+        """
+        today = self._now_myanmar().date()
+        first_day, last_day = start_date.date(), end_date.date()
+        summary_by_date = self._load_day_summaries(employee, first_day, last_day)
+        schedule = request.env['attendance.day.summary'].sudo()._get_schedule(employee)
+
+        present_count = 0.0
+        absent_count = 0.0
+        absent_days = []
+
+        current_date = first_day
+        while current_date <= last_day:
+            day = self._get_day_info(current_date, summary_by_date.get(current_date), schedule)
+            present_count += day['attendance_fraction']
+
+            absent = self._get_absent_entry(day, today)
+            if absent:
+                absent_days.append(absent)
+                absent_count += absent['absent_fraction']
+
+            current_date += timedelta(days=1)
+
+        late_days = self._load_late_days(employee, first_day, last_day)
 
+        return {
+            'present_count': present_count,
+            'absent_count': absent_count,
+            'absent_days': absent_days,
+            'late_days': late_days,
+            'total_late_minutes': sum(day['late_minutes'] for day in late_days),
+        }
 
+    def _load_late_days(self, employee, first_day, last_day, before=None, limit=None):
+        """
+        Late arrivals of the range, most recent first, from one filtered query.
+
+        ``before`` is a check-in datetime (UTC) used as keyset cursor: only
+        arrivals checked in strictly earlier are returned.
+        """
+        domain = [
+            ('employee_id', '=', employee.id),
+            ('check_in_local_date', '>=', first_day),
+            ('check_in_local_date', '<=', last_day),
+            ('late_minutes', '>', 0),
+        ]
+        if before:
+            domain.append(('check_in', '<', before))
+        attendances = request.env['hr.attendance'].sudo().search_read(
+            domain, ['check_in', 'late_minutes', 'late_severity'], order='check_in desc', limit=limit)
+
+        late_days = []
+        for att in attendances:
+            check_in_local = att['check_in'].astimezone(MYANMAR_TZ)
+            late_days.append({
+                'date': check_in_local.date(),
+                'iso_date': check_in_local.strftime('%Y-%m-%d'),
+                'formatted_date': check_in_local.strftime('%A, %B %d, %Y'),
+                'check_in_time': check_in_local.strftime('%H:%M'),
+                'late_minutes': att['late_minutes'],
+                'severity': att['late_severity'],
+                'cursor': fields.Datetime.to_string(att['check_in']),
+            })
+        return late_days
+
+    def _load_day_summaries(self, employee, first_day, last_day):
+        """Fetch the day summaries of ``first_day``..``last_day`` in one query, keyed by date."""
+        summaries = request.env['attendance.day.summary'].sudo().search([
+            ('employee_id', '=', employee.id),
+            ('date', '>=', first_day),
+            ('date', '<=', last_day),
+        ])
+        return {summary.date: summary for summary in summaries}
+
+    def _get_day_info(self, current_date, summary, schedule):
+        """
+        Return the classification of a day from its summary row.
+
+        Days without a row have no attendance at all; they are classified on the
+        fly from the employee's ``schedule`` with the same rules the summary
+        maintenance uses.
+        """
+        if not summary:
+            summary = request.env['attendance.day.summary'].sudo()._classify_day(current_date, None, schedule)
+
+        check_in = summary['check_in'].astimezone(MYANMAR_TZ) if summary['check_in'] else None
+        check_out = summary['check_out'].astimezone(MYANMAR_TZ) if summary['check_out'] else None
+        return {
+            'date': current_date,
+            'check_in': check_in,
+            'check_out': check_out,
+            'attendance_fraction': summary['attendance_fraction'],
+            'absent_fraction': summary['absent_fraction'],
+            'absence_type': summary['absence_type'],
+            'status': summary['status'],
+            'is_weekend': summary['is_weekend'],
+            'is_late': summary['late_minutes'] > 0,
+            'late_minutes': summary['late_minutes'],
+            'severity': summary['severity'] or None,
+        }
+
+    def _get_absent_entry(self, day, today):
+        """Return the absent-list entry for a classified day, or None if not absent."""
+        current_date = day['date']
+        if current_date > today or not day['absent_fraction']:
+            return None
+
+        check_in, check_out = day['check_in'], day['check_out']
+        if not check_in and not check_out:
+            # Full absent
+            return {
+                'date': current_date,
+                'formatted_date': current_date.strftime('%A, %B %d, %Y'),
+                'iso_date': current_date.isoformat(),
+                'status': 'full_absent',
+                'absence_type': day['absence_type'],
+                'attendance_fraction': 0,
+                'absent_fraction': day['absent_fraction'],
+            }
+
+        # Skip marking today as absent if checked in but not checked out yet
+        if current_date == today and check_in and not check_out:
+            return None
+
+        return {
+            'date': current_date,
+            'formatted_date': current_date.strftime('%A, %B %d, %Y'),
+            'iso_date': current_date.isoformat(),
+            'status': 'half_absent',
+            'absence_type': day['absence_type'],
+            'check_in_time': check_in.strftime('%H:%M') if check_in else None,
+            'check_out_time': check_out.strftime('%H:%M') if check_out else None,
+            'attendance_fraction': day['attendance_fraction'],
+            'absent_fraction': day['absent_fraction'],
+        }
+
+    @timed
     def _get_calendar_data(self, employee, year, month):
-        calendar_data = {}
         _, num_days = calendar.monthrange(year, month)
+        days = self._get_calendar_days(employee, [date(year, month, day) for day in range(1, num_days + 1)])
+        return {day['day']: day for day in days}
+
+    def _get_calendar_days(self, employee, dates):
+        """Calendar cells of the given dates (sorted), with one summary query over their span."""
+        if not dates:
+            return []
         today_date = self._now_myanmar().date()
 
-        # Prepare shift names safely
-        if employee.resource_calendar_ids:
-            # Combine multiple calendars into a comma-separated string
-            shift_name = ', '.join(employee.resource_calendar_ids.mapped('name'))
-        else:
-            shift_name = 'Standard Shift (9:00 AM - 6:00 PM)'
-
-        for day in range(1, num_days + 1):
-            current_date = date(year, month, day)
-            weekday = current_date.weekday()
-
-            # Fetch attendance for the day (check_in or check_out)
-            day_att = request.env['hr.attendance'].sudo().search([
-                ('employee_id', '=', employee.id),
-                '|',
-                '&', ('check_in', '>=', datetime(year, month, day)), ('check_in', '<=', datetime(year, month, day, 23, 59, 59)),
-                '&', ('check_out', '>=', datetime(year, month, day)), ('check_out', '<=', datetime(year, month, day, 23, 59, 59))
-            ], limit=1)
-
-            check_in = day_att.check_in.astimezone(MYANMAR_TZ) if day_att and day_att.check_in else None
-            check_out = day_att.check_out.astimezone(MYANMAR_TZ) if day_att and day_att.check_out else None
-
-            # Calculate working hours
-            working_hours = (check_out - check_in).total_seconds() / 3600 if check_in and check_out else 0
-
-            # Determine attendance fraction
-            if check_in and check_out:
-                attendance_fraction = 0.5 if working_hours < 5 else 1.0
-            elif check_in or check_out:
-                attendance_fraction = 0.5
-            else:
-                attendance_fraction = 0.0
-
-            # Determine status
-            if weekday >= 5:
-                status = 'weekend'
-            elif attendance_fraction == 1.0:
-                status = 'present'
-            elif attendance_fraction == 0.5:
-                status = 'partial'
-            else:
-                status = 'absent'
-
-            # Late calculation
-            late_minutes, is_late, severity = 0, False, None
-            if day_att and getattr(day_att, 'display_late_minutes', "00:00") != "00:00":
-                display_late = day_att.display_late_minutes
-                try:
-                    if isinstance(display_late, float):
-                        hours = int(display_late)
-                        minutes = int((display_late - hours) * 60)
-                    else:
-                        hh, mm = display_late.split(":")
-                        hours, minutes = int(hh), int(mm)
-                    late_minutes = hours * 60 + minutes
-                    if late_minutes > 0:
-                        is_late = True
-                        severity = 'low' if late_minutes <= 5 else 'medium' if late_minutes <= 15 else 'high'
-                except:
-                    pass
+        Summary = request.env['attendance.day.summary'].sudo()
+        shift_name = Summary._get_shift_name(employee)
+        schedule = Summary._get_schedule(employee)
+
+        summary_by_date = self._load_day_summaries(employee, dates[0], dates[-1])
+
+        days = []
+        for current_date in dates:
+            info = self._get_day_info(current_date, summary_by_date.get(current_date), schedule)
+            check_in, check_out = info['check_in'], info['check_out']
 
             # Populate calendar data
-            calendar_data[day] = {
+            days.append({
                 'date': current_date,
-                'day': day,
+                'day': current_date.day,
                 'formatted_date': current_date.strftime('%Y-%m-%d'),
                 'check_in_time': check_in.strftime('%H:%M') if check_in else None,
                 'check_out_time': check_out.strftime('%H:%M') if check_out else None,
-                'is_weekend': weekday >= 5,
+                'is_weekend': info['is_weekend'],
                 'is_today': current_date == today_date,
                 'is_future': current_date > today_date,
-                'is_late': is_late,
-                'late_minutes': late_minutes,
-                'severity': severity,
+                'is_late': info['is_late'],
+                'late_minutes': info['late_minutes'],
+                'severity': info['severity'],
                 'has_check_in': bool(check_in),
                 'has_check_out': bool(check_out),
-                'attendance_fraction': attendance_fraction,
-                'status': status,
+                'attendance_fraction': info['attendance_fraction'],
+                'status': info['status'],
                 'shift_name': shift_name
-            }
-
-        return calendar_data
+            })
 
+        return days
 
     def _get_prev_month(self, year, month):
         if month == 1:
@@ -291,121 +551,108 @@ class AttendanceDashboardController(http.Controller):
             return {'year': year + 1, 'month': 1}
         return {'year': year, 'month': month + 1}
     
+    @timed
     def _get_absent_days(self, employee):
         start_date, end_date = self._get_fiscal_period()
-        today = self._now_myanmar().date()
-
-        attendances = request.env['hr.attendance'].sudo().search([
-            ('employee_id', '=', employee.id),
-            '|', '&', ('check_in', '>=', start_date), ('check_in', '<=', end_date),
-                '&', ('check_out', '>=', start_date), ('check_out', '<=', end_date)
-        ])
+        return self._get_period_data(employee, start_date, end_date)['absent_days']
 
-        absent_days = []
-        current_date = start_date.date()
-
-        while current_date <= today:
-            day_att = attendances.filtered(lambda a: 
-                (a.check_in and a.check_in.date() == current_date) or
-                (not a.check_in and a.check_out and a.check_out.date() == current_date)
-            )
-
-            if not day_att and current_date.weekday() < 5:
-                # Full absent
-                absent_days.append({
-                    'date': current_date,
-                    'formatted_date': current_date.strftime('%A, %B %d, %Y'),
-                    'iso_date': current_date.isoformat(),
-                    'status': 'full_absent',
-                    'absence_type': 'Full Day Absent',
-                    'attendance_fraction': 0,
-                    'absent_fraction': 1.0
-                })
-            else:
-                att = day_att[0] if day_att else None
-                if att:
-                    check_in = att.check_in.astimezone(MYANMAR_TZ) if att.check_in else None
-                    check_out = att.check_out.astimezone(MYANMAR_TZ) if att.check_out else None
-                    working_hours = (check_out - check_in).total_seconds() / 3600 if check_in and check_out else 0
-
-                    # Skip marking today as absent if checked in but not checked out yet
-                    if current_date == today and check_in and not check_out:
-                        current_date += timedelta(days=1)
-                        continue
-
-                    if check_in and check_out and working_hours >= 5:
-                        # Full present
-                        pass
-                    else:
-                        if check_in and not check_out:
-                            absence_type = 'Evening Absent'
-                        elif not check_in and check_out:
-                            absence_type = 'Morning Absent'
-                        elif working_hours < 5:
-                            absence_type = 'Half Day Absent (Morning or Evening Absent)'
-                        else:
-                            absence_type = 'Half Day Absent'
-
-                        absent_days.append({
-                            'date': current_date,
-                            'formatted_date': current_date.strftime('%A, %B %d, %Y'),
-                            'iso_date': current_date.isoformat(),
-                            'status': 'half_absent',
-                            'absence_type': absence_type,
-                            'check_in_time': check_in.strftime('%H:%M') if check_in else None,
-                            'check_out_time': check_out.strftime('%H:%M') if check_out else None,
-                            'attendance_fraction': 0.5,
-                            'absent_fraction': 0.5
-                        })
+    @timed
+    def _get_late_days(self, employee):
+        start_date, end_date = self._get_fiscal_period()
+        period = self._get_period_data(employee, start_date, end_date)
+        late_days = period['late_days']
+        total_late_minutes = period['total_late_minutes']
+        avg_lateness = total_late_minutes / len(late_days) if late_days else 0
+        return late_days, total_late_minutes, avg_lateness
 
-            current_date += timedelta(days=1)
+    def _parse_year_month(self, year, month):
+        """Return ``(year, month)`` of a calendar request, defaulting to today, or None when invalid."""
+        today = self._now_myanmar()
+        try:
+            year = int(year) if year else today.year
+            month = int(month) if month else today.month
+        except ValueError:
+            return None
+        if not (date.min.year <= year <= date.max.year and 1 <= month <= 12):
+            return None
+        return year, month
+
+    # --- Pagination ---
+    def _parse_date_cursor(self, value):
+        """Return the date of an absent-list cursor, or None when missing or malformed."""
+        try:
+            return fields.Date.to_date(value) if value else None
+        except ValueError:
+            return None
 
-        return absent_days
+    def _parse_datetime_cursor(self, value):
+        """Return the check-in datetime of a late-list cursor, or None when missing or malformed."""
+        try:
+            return fields.Datetime.to_datetime(value) if value else None
+        except ValueError:
+            return None
 
+    def _next_page_url(self, path, cursor):
+        return f"{path}?{urlencode({'before': cursor})}" if cursor else None
 
-    def _get_late_days(self, employee):
-        start_date, end_date = self._get_fiscal_period()
+    def _page_limit(self, limit):
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return DETAILS_PAGE_SIZE
+        return max(1, min(limit, DETAILS_MAX_PAGE_SIZE))
 
-        attendances = request.env['hr.attendance'].sudo().search([
-            ('employee_id', '=', employee.id),
-            ('check_in', '>=', start_date),
-            ('check_in', '<=', end_date)
-        ])
+    @timed
+    def _get_absent_page(self, employee, before=None, limit=DETAILS_PAGE_SIZE):
+        """
+        One page of absent days, most recent first, keyed by date.
 
-        late_days = []
-        total_late_minutes = 0
+        Walks back from the day before ``before`` (or today) to the fiscal start,
+        loading the summaries one window at a time and stopping as soon as the
+        page is full, so the first page never reads the whole year.
+        ``next_cursor`` is the ISO date to pass as ``before`` for the next page,
+        or None on the last one.
+        """
+        start_date, end_date = self._get_fiscal_period()
+        first_day, today = start_date.date(), end_date.date()
+        window_end = min(today, before - timedelta(days=1)) if before else today
+        schedule = request.env['attendance.day.summary'].sudo()._get_schedule(employee)
+
+        entries = []
+        while window_end >= first_day and len(entries) <= limit:
+            window_start = max(first_day, window_end - timedelta(days=ABSENT_PAGE_WINDOW_DAYS - 1))
+            summary_by_date = self._load_day_summaries(employee, window_start, window_end)
+
+            current_date = window_end
+            while current_date >= window_start and len(entries) <= limit:
+                day = self._get_day_info(current_date, summary_by_date.get(current_date), schedule)
+                absent = self._get_absent_entry(day, today)
+                if absent:
+                    entries.append(absent)
+                current_date -= timedelta(days=1)
+            window_end = window_start - timedelta(days=1)
+
+        # One extra entry is read to know whether an older page exists
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        return {
+            'entries': entries,
+            'next_cursor': entries[-1]['iso_date'] if has_more else None,
+        }
 
-        for att in attendances:
-            display_late = getattr(att, "display_late_minutes", "00:00")
-            if display_late != "00:00":
-                check_in_local = att.check_in.astimezone(MYANMAR_TZ) if att.check_in else None
-                if isinstance(display_late, float):
-                    hours = int(display_late)
-                    minutes = int((display_late - hours) * 60)
-                else:
-                    hh, mm = display_late.split(":")
-                    hours, minutes = int(hh), int(mm)
-
-                late_minutes = hours * 60 + minutes
-                if late_minutes == 0:
-                    continue
-
-                total_late_minutes += late_minutes
-                if late_minutes <= 5:
-                    severity = 'low'
-                elif late_minutes <= 15:
-                    severity = 'medium'
-                else:
-                    severity = 'high'
-
-                late_days.append({
-                    'date': check_in_local.date() if check_in_local else None,
-                    'iso_date': check_in_local.strftime('%Y-%m-%d') if check_in_local else "",
-                    'formatted_date': check_in_local.strftime('%A, %B %d, %Y') if check_in_local else "",
-                    'check_in_time': check_in_local.strftime('%H:%M') if check_in_local else None,
-                    'late_minutes': late_minutes,
-                    'severity': severity,
-                })
+    @timed
+    def _get_late_page(self, employee, before=None, limit=DETAILS_PAGE_SIZE):
+        """
+        One page of late arrivals, most recent first, keyed by check-in time.
 
-        avg_lateness = total_late_minutes / len(late_days) if late_days else 0
-        return late_days, total_late_minutes, avg_lateness
+        ``next_cursor`` is the check-in of the last entry, to pass as ``before``
+        for the next page, or None on the last one.
+        """
+        start_date, end_date = self._get_fiscal_period()
+        entries = self._load_late_days(employee, start_date.date(), end_date.date(), before=before, limit=limit + 1)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        return {
+            'entries': entries,
+            'next_cursor': entries[-1]['cursor'] if has_more else None,
+        }
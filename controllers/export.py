@@ -0,0 +1,113 @@
+from odoo import http, api
+from odoo.http import request
+import csv
+import io
+import logging
+import tempfile
+
+from ..models.attendance_export import EXPORT_HEADER
+from .dashboard import AttendanceDashboardController
+
+_logger = logging.getLogger(__name__)
+
+# Flush the CSV buffer to the client roughly every this many rows
+CSV_FLUSH_ROWS = 500
+XLSX_READ_SIZE = 64 * 1024
+# Rows per worksheet, header included (the XLSX format's limit); longer exports
+# continue on "Attendance 2", "Attendance 3", ...
+XLSX_MAX_ROWS = 1048576
+
+
+class AttendanceExportController(AttendanceDashboardController):
+    """Company-wide streaming export of the daily attendance classification."""
+
+    @http.route('/attendance/export', type='http', auth='user', methods=['GET'])
+    def attendance_export(self, format='csv', employee_ids=None, department_id=None, **kwargs):
+        """
+        Without filter the export is company-wide. ``department_id`` takes one or
+        more comma-separated departments, sub-departments included.
+
+        CSV is streamed as the rows are produced; XLSX is written to a temporary
+        file first, as the workbook can only be read back once closed.
+        """
+        if not request.env.user.has_group('hr.group_hr_user'):
+            return request.not_found()
+
+        try:
+            employee_ids = [int(x) for x in (employee_ids or '').split(',') if x]
+            department_ids = [int(x) for x in (department_id or '').split(',') if x]
+        except ValueError:
+            return request.not_found()
+        domain = []
+        if employee_ids:
+            domain.append(('id', 'in', employee_ids))
+        if department_ids:
+            domain.append(('department_id', 'child_of', department_ids))
+        ids = request.env['hr.employee'].search(domain).ids
+
+        start_date, end_date = self._get_fiscal_period()
+        first_day, last_day = start_date.date(), end_date.date()
+        filename = f"attendance_{first_day.isoformat()}_{last_day.isoformat()}"
+
+        # The request cursor is closed once the response is returned, so the
+        # generator opens its own on the registry
+        registry, uid, context = request.env.registry, request.env.uid, dict(request.env.context)
+        if format == 'xlsx':
+            body = self._stream_xlsx(registry, uid, context, ids, first_day, last_day)
+            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        else:
+            body = self._stream_csv(registry, uid, context, ids, first_day, last_day)
+            content_type = 'text/csv; charset=utf-8'
+            format = 'csv'
+
+        return http.Response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', http.content_disposition(f"{filename}.{format}")),
+        ], direct_passthrough=True)
+
+    # --- Helper Methods ---
+    def _iter_rows(self, registry, uid, context, employee_ids, first_day, last_day):
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            yield from env['attendance.export']._iter_rows(employee_ids, first_day, last_day)
+
+    def _stream_csv(self, registry, uid, context, employee_ids, first_day, last_day):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_HEADER)
+        for count, row in enumerate(self._iter_rows(registry, uid, context, employee_ids, first_day, last_day), 1):
+            writer.writerow(row)
+            if count % CSV_FLUSH_ROWS == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+
+    def _stream_xlsx(self, registry, uid, context, employee_ids, first_day, last_day):
+        import xlsxwriter
+
+        # constant_memory writes each row to disk as it goes; the finished file
+        # is then streamed back in fixed-size blocks
+        with tempfile.TemporaryFile() as output:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            sheet, sheet_count, row_index = None, 0, XLSX_MAX_ROWS
+            for row in self._iter_rows(registry, uid, context, employee_ids, first_day, last_day):
+                if row_index >= XLSX_MAX_ROWS:
+                    # write_row() past the last row silently returns -1
+                    sheet_count += 1
+                    sheet = workbook.add_worksheet(
+                        'Attendance' if sheet_count == 1 else f'Attendance {sheet_count}')
+                    sheet.write_row(0, 0, EXPORT_HEADER)
+                    row_index = 1
+                sheet.write_row(row_index, 0, row)
+                row_index += 1
+            if sheet is None:
+                workbook.add_worksheet('Attendance').write_row(0, 0, EXPORT_HEADER)
+            workbook.close()
+
+            output.seek(0)
+            while True:
+                block = output.read(XLSX_READ_SIZE)
+                if not block:
+                    break
+                yield block
@@ -0,0 +1,93 @@
+# Advisory lock namespace for in-flight password verifications (arbitrary constant)
+VERIFICATION_LOCK_NAMESPACE = 72010
+DEFAULT_MAX_CONCURRENT_VERIFICATIONS = 4
+RETRY_AFTER_BUSY = 2  # seconds
+
+# Failed login limits: (max failures, window in seconds)
+ACCOUNT_FAILURE_LIMIT = (5, 15 * 60)
+# High enough for a whole office behind one NAT address; overridden by the
+# ``attendance_dashboard.ip_failure_limit`` system parameter
+IP_FAILURE_LIMIT = (200, 15 * 60)
+
+
+def try_acquire_verification_slot(cr, slots):
+    """
+    Try to take one of ``slots`` PostgreSQL advisory locks for a verification.
+
+    The locks are transaction-scoped, so the slot is released when the request's
+    transaction ends. Because they live in the database, the limit holds across
+    all Odoo workers rather than per process.
+    """
+    for slot in range(slots):
+        cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", (VERIFICATION_LOCK_NAMESPACE, slot))
+        if cr.fetchone()[0]:
+            return True
+    return False
+
+
+class FailureLimiter:
+    """
+    Sliding-window counter of failed logins per key (account or IP).
+
+    Failures are rows of ``employee.login.failure``, so the limits hold across
+    all Odoo workers; the rows of a key are pruned as new failures come in, and
+    old rows of every key by the daily autovacuum.
+    """
+
+    def __init__(self, scope, max_failures, window):
+        self.scope = scope
+        self.max_failures = max_failures
+        self.window = window
+
+    def retry_after(self, cr, key, max_failures=None):
+        """
+        Seconds until ``key`` may try again, or 0 if it is not blocked.
+
+        ``max_failures`` overrides the limiter's own limit, e.g. from a system
+        parameter.
+        """
+        max_failures = max_failures or self.max_failures
+        cr.execute("""
+            SELECT count(*),
+                   ceil(extract(epoch FROM min(failed_at) + %(window)s * interval '1 second'
+                                           - (now() AT TIME ZONE 'UTC')))
+              FROM (SELECT failed_at
+                      FROM employee_login_failure
+                     WHERE scope = %(scope)s AND key = %(key)s
+                       AND failed_at > (now() AT TIME ZONE 'UTC') - %(window)s * interval '1 second'
+                     ORDER BY failed_at DESC
+                     LIMIT %(max_failures)s) recent
+        """, {'scope': self.scope, 'key': key or '', 'window': self.window, 'max_failures': max_failures})
+        count, remaining = cr.fetchone()
+        if count < max_failures:
+            return 0
+        return max(int(remaining), 1)
+
+    def has_failures(self, cr, key):
+        """Whether ``key`` failed at least once within the window."""
+        cr.execute("""
+            SELECT 1
+              FROM employee_login_failure
+             WHERE scope = %(scope)s AND key = %(key)s
+               AND failed_at > (now() AT TIME ZONE 'UTC') - %(window)s * interval '1 second'
+             LIMIT 1
+        """, {'scope': self.scope, 'key': key or '', 'window': self.window})
+        return bool(cr.fetchone())
+
+    def add_failure(self, cr, key):
+        cr.execute("""
+            DELETE FROM employee_login_failure
+             WHERE scope = %(scope)s AND key = %(key)s
+               AND failed_at <= (now() AT TIME ZONE 'UTC') - %(window)s * interval '1 second'
+        """, {'scope': self.scope, 'key': key or '', 'window': self.window})
+        cr.execute("""
+            INSERT INTO employee_login_failure (scope, key, failed_at)
+            VALUES (%s, %s, now() AT TIME ZONE 'UTC')
+        """, (self.scope, key or ''))
+
+    def reset(self, cr, key):
+        cr.execute("DELETE FROM employee_login_failure WHERE scope = %s AND key = %s", (self.scope, key or ''))
+
+
+account_limiter = FailureLimiter('account', *ACCOUNT_FAILURE_LIMIT)
+ip_limiter = FailureLimiter('ip', *IP_FAILURE_LIMIT)
@@ -0,0 +1,135 @@
+from odoo.http import request
+from contextlib import contextmanager
+from werkzeug.wrappers import Response
+import functools
+import json
+import logging
+import random
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Share of requests profiled, between 0 (off) and 1 (every request)
+SAMPLE_RATE_PARAM = 'attendance_dashboard.profiling_sample_rate'
+
+_local = threading.local()
+
+
+class RequestProfile:
+    """SQL count, SQL time and wall time of each stage of one sampled request."""
+
+    def __init__(self, route):
+        self.route = route
+        self.stages = []
+        self.started = time.perf_counter()
+        self.queries_start = self._query_count()
+        self.sql_time_start = self._sql_time()
+
+    @staticmethod
+    def _query_count():
+        return request.env.cr.sql_log_count
+
+    @staticmethod
+    def _sql_time():
+        # Accumulated by odoo.sql_db for the current HTTP thread
+        return getattr(threading.current_thread(), 'query_time', 0.0)
+
+    @contextmanager
+    def stage(self, name):
+        queries, sql_time = self._query_count(), self._sql_time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({
+                'name': name,
+                'ms': round((time.perf_counter() - started) * 1000, 2),
+                'queries': self._query_count() - queries,
+                'sql_ms': round((self._sql_time() - sql_time) * 1000, 2),
+            })
+
+    def summary(self):
+        return {
+            'route': self.route,
+            'employee_id': request.session.get('employee_number'),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'queries': self._query_count() - self.queries_start,
+            'sql_ms': round((self._sql_time() - self.sql_time_start) * 1000, 2),
+            'stages': self.stages,
+        }
+
+    def server_timing(self, summary):
+        entries = [
+            f'total;dur={summary["total_ms"]}',
+            f'sql;dur={summary["sql_ms"]};desc="{summary["queries"]} queries"',
+        ]
+        entries += [
+            f'{stage["name"].strip("_")};dur={stage["ms"]};desc="{stage["queries"]} queries"'
+            for stage in self.stages
+        ]
+        return ', '.join(entries)
+
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as a stage of the current request profile, if it is sampled."""
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name):
+        yield
+
+
+def timed(func):
+    """Record a helper method as a profile stage named after it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with stage(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _is_sampled():
+    try:
+        rate = float(request.env['ir.config_parameter'].sudo().get_param(SAMPLE_RATE_PARAM, 0.0))
+    except ValueError:
+        # A malformed rate turns profiling off rather than failing every request
+        return False
+    return rate > 0 and random.random() < rate
+
+
+def profiled(func):
+    """
+    Profile a sampled share of a route's requests.
+
+    Stages recorded by ``timed`` helpers and the QWeb render are emitted as a
+    ``Server-Timing`` header and as one structured log line.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not _is_sampled():
+            return func(self, *args, **kwargs)
+
+        profile = _local.profile = RequestProfile(func.__name__)
+        try:
+            with profile.stage('handler'):
+                response = func(self, *args, **kwargs)
+            if getattr(response, 'is_qweb', False):
+                with profile.stage('render'):
+                    response.flatten()
+        finally:
+            _local.profile = None
+
+        summary = profile.summary()
+        # Routes may also return werkzeug exceptions, e.g. request.not_found()
+        if isinstance(response, Response):
+            response.headers['Server-Timing'] = profile.server_timing(summary)
+        _logger.info("attendance_profile %s", json.dumps(summary))
+        return response
+    return wrapper
@@ -1,14 +1,24 @@
 from odoo import http
 from odoo.http import request
 import logging
-import uuid
 import json
 
+from .login_throttle import (
+    DEFAULT_MAX_CONCURRENT_VERIFICATIONS,
+    IP_FAILURE_LIMIT,
+    RETRY_AFTER_BUSY,
+    account_limiter,
+    ip_limiter,
+    try_acquire_verification_slot,
+)
+from .profiling import profiled, stage
+
 _logger = logging.getLogger(__name__)
 
 class EmployeePortal(http.Controller):
 
     @http.route('/employee/register', type='http', auth='public', website=True, methods=['GET', 'POST'], csrf=False)
+    @profiled
     def employee_register(self, **kwargs):
         _logger.info("Rendering employee register: %s", kwargs)
 
@@ -21,19 +31,45 @@ class EmployeePortal(http.Controller):
             password = kwargs.get('password')
             new_password = kwargs.get('new_password')
             forgot = kwargs.get('forgot')
+            remote_ip = request.httprequest.remote_addr
+
+            # Refuse flooded accounts/IPs before spending any CPU on hashing.
+            # Many employees share an office NAT address, so a flooded IP only
+            # blocks the accounts that failed themselves: a guesser gets one
+            # attempt per account, and a colleague's typos lock nobody else out
+            retry_after = account_limiter.retry_after(request.env.cr, emp_id)
+            if not retry_after and account_limiter.has_failures(request.env.cr, emp_id):
+                retry_after = ip_limiter.retry_after(
+                    request.env.cr, remote_ip, self._get_ip_failure_limit())
+            if retry_after:
+                return self._throttled_response(
+                    'Too many failed attempts. Please try again later.', 429, retry_after, emp_id)
 
             employee = request.env['hr.employee'].sudo().search(
                 [('employee_number', '=', emp_id)], limit=1)
             if not employee:
+                ip_limiter.add_failure(request.env.cr, remote_ip)
                 return request.render('attendance_dashboard.register_template', {
                     'error': 'Employee ID not found.',
                     'employee_number': emp_id,
                     'forgot': False,
                 })
 
+            # pbkdf2 is CPU-heavy: bound in-flight verifications across all workers
+            if not try_acquire_verification_slot(request.env.cr, self._get_max_concurrent_verifications()):
+                return self._throttled_response(
+                    'The server is busy. Please try again in a moment.', 503, RETRY_AFTER_BUSY, emp_id)
+
             login_rec = request.env['employee.login'].sudo().search(
                 [('employee_number', '=', employee.id)], limit=1)
 
+            if not login_rec and not self._self_registration_allowed():
+                return request.render('attendance_dashboard.register_template', {
+                    'error': 'No account for this Employee ID yet. Please contact HR.',
+                    'employee_number': emp_id,
+                    'forgot': False,
+                })
+
             if not login_rec:  # register
                 login_rec = request.env['employee.login'].sudo().create({
                     'employee_number': employee.id,
@@ -55,19 +91,15 @@ class EmployeePortal(http.Controller):
                 })
 
             # Attempt login
-            if login_rec.check_password(password):
-                request.session['employee_number'] = employee.id
-                token = str(uuid.uuid4())
-                login_rec.sudo().write({'login_token': token})
-                if 'Mobile' in request.httprequest.headers.get('User-Agent', ''):
-                    return request.make_response(
-                        json.dumps({'status': 'success', 'token': token}),
-                        headers={'Content-Type': 'application/json'}
-                    )
-                else:
-                    return request.redirect('/attendance/dashboard')
+            with stage('check_password'):
+                password_ok = login_rec.check_password(password)
+            if password_ok:
+                account_limiter.reset(request.env.cr, emp_id)
+                return self._logged_in_response(login_rec)
 
             else:
+                account_limiter.add_failure(request.env.cr, emp_id)
+                ip_limiter.add_failure(request.env.cr, remote_ip)
                 return request.render('attendance_dashboard.register_template', {
                     'error': 'Wrong password.',
                     'employee_number': emp_id,
@@ -79,3 +111,72 @@ class EmployeePortal(http.Controller):
             'employee_number': kwargs.get('employee_number', ''),
             'forgot': kwargs.get('forgot', '').lower() in ['1', 'true', 'yes'],
         })
+
+    @http.route('/employee/activate', type='http', auth='public', website=True, methods=['GET', 'POST'], csrf=False)
+    def employee_activate(self, token=None, **kwargs):
+        """
+        Redeem the single-use activation link of a provisioned login: the
+        employee chooses a password and is logged in, and the link stops working.
+        """
+        Login = request.env['employee.login'].sudo()
+        login_rec = Login._get_login_by_activation_token(token)
+        if not login_rec:
+            return request.render('attendance_dashboard.register_template', {
+                'error': 'This activation link is invalid or has expired. Please contact HR.',
+                'employee_number': '',
+                'forgot': False,
+            })
+        values = {
+            'activation_token': token,
+            'employee_number': login_rec.employee_number.employee_number,
+            'forgot': False,
+        }
+
+        if request.httprequest.method == 'POST':
+            new_password = kwargs.get('new_password')
+            if not new_password:
+                return request.render('attendance_dashboard.register_template', dict(
+                    values, error='Please enter a new password.'))
+            login_rec = Login._redeem_activation_token(token, new_password)
+            if not login_rec:
+                return request.render('attendance_dashboard.register_template', {
+                    'error': 'This activation link is invalid or has expired. Please contact HR.',
+                    'employee_number': '',
+                    'forgot': False,
+                })
+            return self._logged_in_response(login_rec)
+
+        return request.render('attendance_dashboard.register_template', values)
+
+    def _logged_in_response(self, login_rec):
+        """Open the employee's session with a fresh token: JSON for the mobile app, else the dashboard."""
+        request.session['employee_number'] = login_rec.employee_number.id
+        request.session.pop('employee_token', None)
+        token = login_rec.sudo()._rotate_token()
+        if 'Mobile' in request.httprequest.headers.get('User-Agent', ''):
+            return request.make_response(
+                json.dumps({'status': 'success', 'token': token}),
+                headers={'Content-Type': 'application/json'}
+            )
+        return request.redirect('/attendance/dashboard')
+
+    def _get_max_concurrent_verifications(self):
+        return int(request.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.max_concurrent_logins', DEFAULT_MAX_CONCURRENT_VERIFICATIONS))
+
+    def _get_ip_failure_limit(self):
+        return int(request.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.ip_failure_limit', IP_FAILURE_LIMIT[0]))
+
+    def _self_registration_allowed(self):
+        # Turn off once the accounts are provisioned in bulk, so that a first
+        # login no longer registers whatever password is typed
+        return request.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.self_registration', 'True').lower() in ('1', 'true', 'yes')
+
+    def _throttled_response(self, message, status, retry_after, emp_id):
+        return request.render('attendance_dashboard.register_template', {
+            'error': message,
+            'employee_number': emp_id,
+            'forgot': False,
+        }, status=status, headers=[('Retry-After', str(retry_after))])
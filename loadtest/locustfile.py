@@ -0,0 +1,91 @@
+"""
+The 9 AM rush: employees log in, then open the dashboard, the calendar and
+their late arrivals, with think times in between.
+
+Seed the database first (see ``seed.py``), then run against a local Odoo:
+
+    locust -f loadtest/locustfile.py --host http://localhost:8069 --headless \
+        --csv loadtest/results/run
+
+The load follows ``MorningSpike``: users arrive over ``LOADTEST_RAMP`` seconds
+up to ``LOADTEST_USERS``, stay for ``LOADTEST_HOLD`` seconds, then the run
+stops. Locust's own statistics (and the ``--csv`` files) report throughput,
+latency percentiles and failures per route; a per-route p50/p95/p99 summary is
+also printed when the run ends, to paste in before/after comparisons.
+"""
+import os
+import random
+
+from locust import HttpUser, LoadTestShape, SequentialTaskSet, between, events, task
+
+USERS = int(os.environ.get('LOADTEST_USERS', 200))
+RAMP = int(os.environ.get('LOADTEST_RAMP', 60))
+HOLD = int(os.environ.get('LOADTEST_HOLD', 300))
+
+# Must match the seeded pool
+EMPLOYEES = int(os.environ.get('LOADTEST_EMPLOYEES', 200))
+PASSWORD = os.environ.get('LOADTEST_PASSWORD', 'loadtest')
+PREFIX = os.environ.get('LOADTEST_PREFIX', 'LOAD')
+
+
+class MorningVisit(SequentialTaskSet):
+    """One employee's visit: dashboard first, then the calendar and the late list."""
+
+    @task
+    def dashboard(self):
+        self.client.get('/attendance/dashboard', name='/attendance/dashboard')
+
+    @task
+    def calendar(self):
+        self.client.get('/attendance/calendar', name='/attendance/calendar')
+
+    @task
+    def late(self):
+        self.client.get('/attendance/late', name='/attendance/late')
+
+
+class Employee(HttpUser):
+    wait_time = between(2, 8)
+    tasks = [MorningVisit]
+
+    def on_start(self):
+        employee_number = f'{PREFIX}{random.randrange(EMPLOYEES):05d}'
+        with self.client.post('/employee/register', data={
+            'employee_number': employee_number,
+            'password': PASSWORD,
+        }, name='/employee/register', allow_redirects=False, catch_response=True) as response:
+            # A successful login redirects to the dashboard, which the visit then loads
+            location = response.headers.get('Location', '')
+            if response.status_code not in (302, 303) or not location.endswith('/attendance/dashboard'):
+                response.failure(f'login failed for {employee_number} (HTTP {response.status_code})')
+
+
+class MorningSpike(LoadTestShape):
+    """Ramp up to the full workforce, hold, then stop."""
+
+    def tick(self):
+        run_time = self.get_run_time()
+        if run_time > RAMP + HOLD:
+            return None
+        spawn_rate = max(USERS / RAMP, 1) if RAMP else USERS
+        return USERS, spawn_rate
+
+
+@events.quitting.add_listener
+def print_summary(environment, **kwargs):
+    stats = environment.stats
+    print(f"\n{'route':<26}{'requests':>10}{'req/s':>9}{'p50':>8}{'p95':>8}{'p99':>8}{'errors':>9}")
+    for entry in sorted(stats.entries.values(), key=lambda entry: entry.name):
+        print(
+            f"{entry.name:<26}{entry.num_requests:>10}{entry.total_rps:>9.1f}"
+            f"{entry.get_response_time_percentile(0.5):>8.0f}"
+            f"{entry.get_response_time_percentile(0.95):>8.0f}"
+            f"{entry.get_response_time_percentile(0.99):>8.0f}"
+            f"{entry.fail_ratio:>8.1%} "
+        )
+    total = stats.total
+    print(f"{'total':<26}{total.num_requests:>10}{total.total_rps:>9.1f}"
+          f"{total.get_response_time_percentile(0.5):>8.0f}"
+          f"{total.get_response_time_percentile(0.95):>8.0f}"
+          f"{total.get_response_time_percentile(0.99):>8.0f}"
+          f"{total.fail_ratio:>8.1%} ")
@@ -0,0 +1,60 @@
+"""
+Seed a local database with the synthetic employees used by the load test.
+
+Run inside an Odoo shell of the target database:
+
+    LOADTEST_EMPLOYEES=500 odoo-bin shell -d <db> < loadtest/seed.py
+
+Employees are numbered ``LOAD00000``, ``LOAD00001``... and all share the
+``LOADTEST_PASSWORD`` password. Their attendance history covers the current
+fiscal period, generated like the benchmark dataset. Seeding is skipped for
+employees that already exist, so the script can be re-run to grow the pool.
+"""
+import logging
+import os
+
+from odoo import fields
+from odoo.addons.attendance_dashboard.models.attendance_day_summary import fiscal_period_start, to_local_date
+from odoo.addons.attendance_dashboard.tests.common import generate_attendance_vals
+
+_logger = logging.getLogger('attendance_dashboard.loadtest')
+
+EMPLOYEES = int(os.environ.get('LOADTEST_EMPLOYEES', 200))
+PASSWORD = os.environ.get('LOADTEST_PASSWORD', 'loadtest')
+PREFIX = os.environ.get('LOADTEST_PREFIX', 'LOAD')
+BATCH_SIZE = 50
+
+
+def seed(env):
+    today = to_local_date(fields.Datetime.now())
+    first_day = fiscal_period_start(today)
+    Employee = env['hr.employee'].sudo()
+
+    numbers = [f'{PREFIX}{i:05d}' for i in range(EMPLOYEES)]
+    existing = set(Employee.search([('employee_number', 'in', numbers)]).mapped('employee_number'))
+    missing = [number for number in numbers if number not in existing]
+    _logger.info("Load-test seed: %s employees present, %s to create", len(existing), len(missing))
+
+    for offset in range(0, len(missing), BATCH_SIZE):
+        batch = missing[offset:offset + BATCH_SIZE]
+        employees = Employee.create([{'name': f'Load Test {number}', 'employee_number': number} for number in batch])
+        vals_list, open_indexes = generate_attendance_vals(employees.ids, first_day, today, seed=offset)
+        attendances = env['hr.attendance'].sudo().create(vals_list)
+
+        # Forgotten check-outs, as in the benchmark dataset
+        forgotten = attendances.browse([attendances.ids[i] for i in open_indexes])
+        if forgotten:
+            env.cr.execute("""
+                UPDATE hr_attendance SET check_out = NULL, check_out_local_date = NULL WHERE id IN %s
+            """, [tuple(forgotten.ids)])
+            forgotten.invalidate_recordset()
+            env['attendance.day.summary']._refresh_days(forgotten._get_summary_keys())
+
+        for employee in employees:
+            env['employee.login'].sudo().create({'employee_number': employee.id, 'password': PASSWORD})
+        env.cr.commit()
+        env.invalidate_all()
+        _logger.info("Load-test seed: %s/%s employees created", min(offset + BATCH_SIZE, len(missing)), len(missing))
+
+
+seed(env)  # noqa: F821 -- provided by odoo-bin shell
@@ -0,0 +1,16 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """
+    Give the login tokens issued before tokens expired a full lifetime, and
+    build the day summaries of the history recorded before they existed.
+    """
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    cr.execute("""
+        UPDATE employee_login SET token_expiry = %s
+         WHERE login_token IS NOT NULL AND token_expiry IS NULL
+    """, [env['employee.login']._new_token_expiry()])
+    env['attendance.day.summary']._backfill(auto_commit=True)
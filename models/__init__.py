@@ -1 +1,9 @@
-from . import employee_login
\ No newline at end of file
+from . import employee_login
+from . import employee_login_failure
+from . import attendance_day_summary
+from . import attendance_month_rollup
+from . import resource_calendar
+from . import hr_employee
+from . import hr_attendance
+from . import attendance_export
+from . import ir_websocket
\ No newline at end of file
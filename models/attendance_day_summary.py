@@ -0,0 +1,409 @@
+from odoo import models, fields, api
+from collections import defaultdict
+import pytz
+import logging
+import threading
+
+from .resource_calendar import WorkSchedule
+from .stats_cache import stats_cache
+
+_logger = logging.getLogger(__name__)
+
+MYANMAR_TZ = pytz.timezone('Asia/Yangon')
+
+# A day with less than this many worked hours only counts as half present; the
+# threshold is scaled to the scheduled hours of the day, relative to a standard day
+HALF_DAY_HOURS = 5
+STANDARD_DAY_HOURS = 8
+
+# Bus notification sent to an employee when their day summaries change
+DAY_UPDATE_NOTIFICATION = 'attendance_dashboard/day_update'
+
+
+LATE_SEVERITY = [
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+]
+
+
+def late_severity(late_minutes):
+    """Severity of a late arrival: up to 5 minutes is low, up to 15 medium."""
+    if late_minutes <= 0:
+        return False
+    return 'low' if late_minutes <= 5 else 'medium' if late_minutes <= 15 else 'high'
+
+
+def fiscal_period_start(today):
+    """First day of the fiscal period containing ``today``: the latest August 29."""
+    start = today.replace(month=8, day=29)
+    return start if today >= start else start.replace(year=today.year - 1)
+
+
+def to_local(stamp):
+    """Return a naive UTC datetime as an aware Myanmar-local datetime."""
+    return pytz.utc.localize(stamp).astimezone(MYANMAR_TZ)
+
+
+def to_local_date(stamp):
+    """Return the Myanmar-local date of a naive UTC datetime."""
+    return to_local(stamp).date()
+
+
+class AttendanceDaySummary(models.Model):
+    _name = 'attendance.day.summary'
+    _description = 'Attendance Day Summary'
+    _order = 'employee_id, date'
+
+    employee_id = fields.Many2one('hr.employee', required=True, index=True, ondelete='cascade')
+    date = fields.Date(required=True, index=True)
+    attendance_id = fields.Many2one('hr.attendance', ondelete='set null')
+    check_in = fields.Datetime()
+    check_out = fields.Datetime()
+    working_hours = fields.Float()
+    attendance_fraction = fields.Float()
+    absent_fraction = fields.Float()
+    absence_type = fields.Char()
+    late_minutes = fields.Integer()
+    severity = fields.Selection(LATE_SEVERITY)
+    status = fields.Selection([
+        ('present', 'Present'),
+        ('partial', 'Partial'),
+        ('absent', 'Absent'),
+        ('weekend', 'Weekend'),
+        ('holiday', 'Holiday'),
+    ])
+    is_weekend = fields.Boolean()
+
+    _sql_constraints = [
+        ('employee_date_uniq', 'unique(employee_id, date)', 'Only one summary per employee and day is allowed.'),
+    ]
+
+    # --- Classification rules ---
+    @api.model
+    def _get_shift_name(self, employee):
+        """Display name of the employee's working schedule(s)."""
+        calendars = self._get_employee_calendars(employee)
+        if calendars:
+            # Combine multiple calendars into a comma-separated string
+            return ', '.join(calendars.mapped('name'))
+        return 'Standard Shift (9:00 AM - 6:00 PM)'
+
+    @api.model
+    def _get_employee_calendars(self, employee):
+        """The employee's shifts: ``resource_calendar_ids`` when installed, else the standard one."""
+        if 'resource_calendar_ids' in employee._fields:
+            return employee.resource_calendar_ids
+        return employee.resource_calendar_id
+
+    @api.model
+    def _get_calendar_employees(self, calendars):
+        """Employees working on any of the given calendars."""
+        Employee = self.env['hr.employee'].sudo().with_context(active_test=False)
+        domain = [('resource_calendar_id', 'in', calendars.ids)]
+        if 'resource_calendar_ids' in Employee._fields:
+            domain = ['|', ('resource_calendar_ids', 'in', calendars.ids)] + domain
+        return Employee.search(domain)
+
+    @api.model
+    def _get_schedule(self, employee):
+        """The employee's working-day lookup, built from the cached compiled calendars."""
+        return WorkSchedule([calendar._get_compiled_rules() for calendar in self._get_employee_calendars(employee)])
+
+    @api.model
+    def _classify_day(self, day, att, schedule):
+        """
+        Apply the attendance, absence, non-working day and late rules to one local day.
+
+        ``att`` is the attendance representing the day, or a falsy value when the
+        employee has none; ``schedule`` is the employee's ``_get_schedule``.
+        Returns the summary values (without employee and date).
+        """
+        rules = schedule.day_rules(day)
+        is_weekend = not rules.hours
+        half_day_hours = HALF_DAY_HOURS * rules.hours / STANDARD_DAY_HOURS if rules.hours else HALF_DAY_HOURS
+        check_in = att.check_in if att else False
+        check_out = att.check_out if att else False
+        working_hours = (check_out - check_in).total_seconds() / 3600 if check_in and check_out else 0
+
+        # Attendance fraction
+        if check_in and check_out:
+            attendance_fraction = 0.5 if working_hours < half_day_hours else 1.0
+        elif check_in or check_out:
+            attendance_fraction = 0.5
+        else:
+            attendance_fraction = 0.0
+
+        # Status
+        if is_weekend:
+            status = 'holiday' if rules.is_holiday else 'weekend'
+        elif attendance_fraction == 1.0:
+            status = 'present'
+        elif attendance_fraction == 0.5:
+            status = 'partial'
+        else:
+            status = 'absent'
+
+        # Absence
+        absent_fraction, absence_type = 0.0, False
+        if not check_in and not check_out:
+            if not is_weekend:
+                absent_fraction, absence_type = 1.0, 'Full Day Absent'
+        elif not (check_in and check_out and working_hours >= half_day_hours):
+            absent_fraction = 0.5
+            if check_in and not check_out:
+                absence_type = 'Evening Absent'
+            elif not check_in and check_out:
+                absence_type = 'Morning Absent'
+            else:
+                absence_type = 'Half Day Absent (Morning or Evening Absent)'
+
+        # Lateness, stored on the attendance
+        late_minutes = att.late_minutes if att else 0
+        severity = att.late_severity if att else False
+
+        return {
+            'attendance_id': att.id if att else False,
+            'check_in': check_in,
+            'check_out': check_out,
+            'working_hours': working_hours,
+            'attendance_fraction': attendance_fraction,
+            'absent_fraction': absent_fraction,
+            'absence_type': absence_type,
+            'late_minutes': late_minutes,
+            'severity': severity,
+            'status': status,
+            'is_weekend': is_weekend,
+        }
+
+    # --- Maintenance ---
+    @api.model
+    def _index_attendances(self, attendances, first_day, last_day):
+        """
+        Index attendances by Myanmar-local date within ``first_day``..``last_day``.
+
+        A record is indexed under its check-in date and, if that differs, under its
+        check-out date. When several records fall on the same day the first one in
+        the model order wins.
+        """
+        attendance_by_date = {}
+        for att in attendances:
+            for local_date in (att.check_in_local_date, att.check_out_local_date):
+                if local_date and first_day <= local_date <= last_day:
+                    attendance_by_date.setdefault(local_date, att)
+        return attendance_by_date
+
+    @api.model
+    def _refresh_days(self, keys, notify=False):
+        """
+        Recompute the summary rows of the given ``(employee_id, date)`` pairs.
+
+        With ``notify``, each employee is sent the refreshed dates on the bus so
+        open dashboards update in place.
+        """
+        days_by_employee = defaultdict(set)
+        for employee_id, day in keys:
+            if employee_id and day:
+                days_by_employee[employee_id].add(day)
+
+        Attendance = self.env['hr.attendance'].sudo()
+        Summary = self.sudo()
+        for employee_id, days in days_by_employee.items():
+            schedule = self._get_schedule(self.env['hr.employee'].sudo().browse(employee_id))
+            day_list = list(days)
+            attendances = Attendance.search([
+                ('employee_id', '=', employee_id),
+                '|', ('check_in_local_date', 'in', day_list), ('check_out_local_date', 'in', day_list),
+            ])
+            attendance_by_date = self._index_attendances(attendances, min(days), max(days))
+            existing = {
+                row.date: row
+                for row in Summary.search([('employee_id', '=', employee_id), ('date', 'in', day_list)])
+            }
+
+            to_create = []
+            for day in sorted(days):
+                att = attendance_by_date.get(day)
+                row = existing.get(day)
+                if not att and not row:
+                    # Days without attendance stay implicit (absent on working days)
+                    continue
+                vals = self._classify_day(day, att, schedule)
+                if row:
+                    row.write(vals)
+                else:
+                    to_create.append(dict(vals, employee_id=employee_id, date=day))
+            if to_create:
+                Summary.create(to_create)
+
+        self.env['attendance.month.rollup'].sudo()._invalidate(days_by_employee)
+        stats_cache.invalidate(self.env.cr.dbname, days_by_employee)
+        if notify:
+            self._notify_day_updates(days_by_employee)
+
+    @api.model
+    def _notify_day_updates(self, days_by_employee):
+        """Send each employee the dates whose summary changed; delivered once the transaction commits."""
+        Employee = self.env['hr.employee'].sudo()
+        for employee_id, days in days_by_employee.items():
+            self.env['bus.bus']._sendone(Employee.browse(employee_id), DAY_UPDATE_NOTIFICATION, {
+                'dates': sorted(day.isoformat() for day in days),
+            })
+
+    @api.model
+    def _get_employee_stamp(self, employee_id, first_day, last_day):
+        """
+        Return a cheap fingerprint of an employee's summaries over a date range.
+
+        Any create, write or delete of a row in the range changes the row count or
+        the write dates, so the stamp is used to validate cached periods. Days
+        without a row are classified from the schedule: the employee's write date
+        (calendar assignment) and the latest calendar version cover those.
+        """
+        self.flush_model()
+        self.env['hr.employee'].flush_model(['write_date'])
+        self.env['resource.calendar'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT count(*), max(write_date), sum(extract(epoch FROM write_date)),
+                   (SELECT write_date FROM hr_employee WHERE id = %(employee_id)s),
+                   (SELECT max(write_date) FROM resource_calendar)
+              FROM attendance_day_summary
+             WHERE employee_id = %(employee_id)s AND date >= %(first_day)s AND date <= %(last_day)s
+        """, {'employee_id': employee_id, 'first_day': first_day, 'last_day': last_day})
+        return tuple(self.env.cr.fetchone())
+
+    @api.model
+    def _backfill(self, employee_ids=None, batch_size=1000, auto_commit=False):
+        """
+        Rebuild the summary rows from the existing attendance history.
+
+        With ``auto_commit`` each batch is committed on its own (install and
+        upgrade of the module), so a large history never holds one long
+        transaction.
+        """
+        auto_commit = auto_commit and not getattr(threading.current_thread(), 'testing', False)
+        domain = [('employee_id', 'in', employee_ids)] if employee_ids else []
+        Attendance = self.env['hr.attendance'].sudo()
+        attendance_ids = Attendance.search(domain, order='employee_id, check_in').ids
+        _logger.info("Backfilling attendance day summaries from %s attendances", len(attendance_ids))
+
+        for offset in range(0, len(attendance_ids), batch_size):
+            batch = Attendance.browse(attendance_ids[offset:offset + batch_size])
+            self._refresh_days(batch._get_summary_keys())
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            _logger.info("Backfilled %s/%s attendances", min(offset + batch_size, len(attendance_ids)), len(attendance_ids))
+        return True
+
+    @api.model
+    def _get_reclassify_range(self, first_day=None, last_day=None):
+        """Return the range reclassified by ``_reclassify``: the current fiscal period by default."""
+        today = to_local_date(fields.Datetime.now())
+        return first_day or fiscal_period_start(today), last_day or today
+
+    @api.model
+    def _reclassify(self, employee_ids, first_day=None, last_day=None):
+        """
+        Reapply the classification rules after a calendar change.
+
+        Defaults to the current fiscal period; without ``display_late_minutes``
+        the lateness of the attendances is recomputed too, as it comes from the
+        scheduled start. Existing rows are reclassified; days without a row are
+        classified on the fly, so the rollups and cached periods of the whole
+        range are dropped as well.
+        """
+        first_day, last_day = self._get_reclassify_range(first_day, last_day)
+
+        if 'display_late_minutes' not in self.env['hr.attendance']._fields:
+            Attendance = self.env['hr.attendance'].sudo()
+            attendances = Attendance.search([
+                ('employee_id', 'in', employee_ids),
+                ('check_in_local_date', '>=', first_day),
+                ('check_in_local_date', '<=', last_day),
+            ])
+            for fname in ('late_minutes', 'late_severity'):
+                self.env.add_to_compute(Attendance._fields[fname], attendances)
+            attendances.flush_recordset(['late_minutes', 'late_severity'])
+
+        rows = self.sudo().search([
+            ('employee_id', 'in', employee_ids),
+            ('date', '>=', first_day),
+            ('date', '<=', last_day),
+        ])
+        _logger.info("Reclassifying %s attendance day summaries of %s employees", len(rows), len(employee_ids))
+        self._refresh_days({(row.employee_id.id, row.date) for row in rows})
+        self.env['attendance.month.rollup'].sudo()._invalidate_range(employee_ids, first_day, last_day)
+        stats_cache.invalidate(self.env.cr.dbname, employee_ids)
+        return True
+
+    # --- Aggregates ---
+    @api.model
+    def _get_period_totals(self, employee_ids, first_day, last_day, today):
+        """
+        Present, absent and late totals of many employees with one grouped query.
+
+        Follows the same rules as the per-employee dashboard: fractions come from
+        the summary rows, working days without a row are full absences, and an
+        open check-in today is not counted as absent yet.
+        """
+        if not employee_ids:
+            return {}
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT employee_id,
+                   sum(attendance_fraction),
+                   sum(absent_fraction) FILTER (
+                       WHERE date <= %(today)s
+                         AND NOT (date = %(today)s AND check_in IS NOT NULL AND check_out IS NULL)
+                   ),
+                   count(*) FILTER (
+                       WHERE absent_fraction > 0 AND date <= %(today)s
+                         AND NOT (date = %(today)s AND check_in IS NOT NULL AND check_out IS NULL)
+                   ),
+                   count(*) FILTER (WHERE date <= %(today)s AND NOT is_weekend)
+              FROM attendance_day_summary
+             WHERE employee_id = ANY(%(employee_ids)s)
+               AND date >= %(first_day)s AND date <= %(last_day)s
+             GROUP BY employee_id
+        """, {
+            'employee_ids': list(employee_ids),
+            'first_day': first_day,
+            'last_day': last_day,
+            'today': today,
+        })
+        rows = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+        # Late arrivals straight from the stored, indexed hr.attendance.late_minutes
+        late_groups = self.env['hr.attendance'].sudo().read_group([
+            ('employee_id', 'in', list(employee_ids)),
+            ('check_in_local_date', '>=', first_day),
+            ('check_in_local_date', '<=', last_day),
+            ('late_minutes', '>', 0),
+        ], ['late_minutes:sum'], ['employee_id'], lazy=False)
+        late_by_employee = {
+            group['employee_id'][0]: (group['__count'], group['late_minutes'])
+            for group in late_groups
+        }
+
+        # Working days depend on the calendars: count them once per distinct set
+        working_days_by_calendars = {}
+        totals = {}
+        for employee in self.env['hr.employee'].sudo().browse(list(employee_ids)):
+            employee_id = employee.id
+            calendar_ids = tuple(self._get_employee_calendars(employee).ids)
+            if calendar_ids not in working_days_by_calendars:
+                working_days_by_calendars[calendar_ids] = self._get_schedule(employee).count_working_days(
+                    first_day, min(last_day, today))
+            working_days = working_days_by_calendars[calendar_ids]
+            present, absent, absent_rows, working_rows = rows.get(employee_id, (0, 0, 0, 0))
+            late_count, late_minutes = late_by_employee.get(employee_id, (0, 0))
+            totals[employee_id] = {
+                'attendanceCount': round(present or 0, 1),
+                'absentCount': round((absent or 0) + working_days - working_rows, 1),
+                'absentDays': absent_rows + working_days - working_rows,
+                'lateCount': late_count,
+                'lateMinutes': late_minutes,
+            }
+        return totals
+
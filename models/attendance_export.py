@@ -0,0 +1,96 @@
+from odoo import models, api
+from datetime import datetime, timedelta
+import logging
+
+from .attendance_day_summary import to_local
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_HEADER = [
+    'Employee ID', 'Employee', 'Date', 'Status', 'Attendance', 'Absent',
+    'Check In', 'Check Out', 'Late Minutes', 'Severity', 'Shift',
+]
+
+
+class AttendanceExport(models.AbstractModel):
+    _name = 'attendance.export'
+    _description = 'Attendance Export'
+
+    @api.model
+    def _iter_attendance_keys(self, employee_ids, first_day, last_day):
+        """
+        Yield ``(employee_id, attendance_id)`` ordered by employee and check-in.
+
+        Attendances are fetched in chunks keyed on ``(employee_id, check_in, id)``
+        rather than an offset, so every chunk is an index range scan whatever the
+        export size.
+        """
+        self.env['hr.attendance'].flush_model(['employee_id', 'check_in', 'check_in_local_date'])
+        last_key = (0, datetime.min, 0)
+        while True:
+            self.env.cr.execute("""
+                SELECT employee_id, check_in, id
+                  FROM hr_attendance
+                 WHERE employee_id = ANY(%s)
+                   AND check_in_local_date >= %s AND check_in_local_date <= %s
+                   AND (employee_id, check_in, id) > (%s, %s, %s)
+                 ORDER BY employee_id, check_in, id
+                 LIMIT %s
+            """, (list(employee_ids), first_day, last_day, *last_key, EXPORT_CHUNK_SIZE))
+            rows = self.env.cr.fetchall()
+            for employee_id, _check_in, attendance_id in rows:
+                yield employee_id, attendance_id
+            if len(rows) < EXPORT_CHUNK_SIZE:
+                return
+            last_key = rows[-1]
+
+    @api.model
+    def _iter_rows(self, employee_ids, first_day, last_day):
+        """
+        Yield one export row per employee and day of ``first_day``..``last_day``.
+
+        Only one employee's attendances are held in memory at a time, and their
+        cache is dropped once the employee is written out, so memory stays flat.
+        """
+        Summary = self.env['attendance.day.summary']
+        Attendance = self.env['hr.attendance'].sudo()
+        employees = self.env['hr.employee'].sudo().browse(sorted(employee_ids))
+        keys = self._iter_attendance_keys(employees.ids, first_day, last_day)
+        current = next(keys, None)
+
+        for employee in employees:
+            attendance_ids = []
+            while current and current[0] <= employee.id:
+                if current[0] == employee.id:
+                    attendance_ids.append(current[1])
+                current = next(keys, None)
+
+            # Latest check-in first, as the dashboard does
+            attendances = Attendance.browse(attendance_ids[::-1])
+            attendance_by_date = Summary._index_attendances(attendances, first_day, last_day)
+            employee_number = employee.employee_number or ''
+            shift_name = Summary._get_shift_name(employee)
+            schedule = Summary._get_schedule(employee)
+
+            day = first_day
+            while day <= last_day:
+                vals = Summary._classify_day(day, attendance_by_date.get(day), schedule)
+                check_in, check_out = vals['check_in'], vals['check_out']
+                yield [
+                    employee_number,
+                    employee.name,
+                    day.isoformat(),
+                    vals['status'],
+                    vals['attendance_fraction'],
+                    vals['absent_fraction'],
+                    to_local(check_in).strftime('%H:%M') if check_in else '',
+                    to_local(check_out).strftime('%H:%M') if check_out else '',
+                    vals['late_minutes'],
+                    vals['severity'] or '',
+                    shift_name,
+                ]
+                day += timedelta(days=1)
+
+            Attendance.invalidate_model()
@@ -0,0 +1,215 @@
+from odoo import models, fields, api
+from datetime import timedelta
+import json
+import logging
+import threading
+
+from .attendance_day_summary import fiscal_period_start, to_local_date
+
+_logger = logging.getLogger(__name__)
+
+# Progress of the nightly run, so an interrupted run resumes where it stopped
+PROGRESS_PARAM = 'attendance_dashboard.rollup_progress'
+
+
+def month_ranges(first_day, last_day):
+    """Split ``first_day``..``last_day`` into ``(first, last)`` ranges, one per calendar month."""
+    ranges = []
+    start = first_day
+    while start <= last_day:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = min(last_day, next_month - timedelta(days=1))
+        ranges.append((start, end))
+        start = next_month
+    return ranges
+
+
+class AttendanceMonthRollup(models.Model):
+    _name = 'attendance.month.rollup'
+    _description = 'Attendance Month Rollup'
+    _order = 'employee_id, first_day'
+
+    employee_id = fields.Many2one('hr.employee', required=True, index=True, ondelete='cascade')
+    period_start = fields.Date(required=True, index=True)
+    first_day = fields.Date(required=True)
+    last_day = fields.Date(required=True)
+    attendance_count = fields.Float()
+    absent_count = fields.Float()
+    absent_days = fields.Integer()
+    late_count = fields.Integer()
+    late_minutes = fields.Integer()
+
+    _sql_constraints = [
+        ('employee_month_uniq', 'unique(employee_id, period_start, first_day)',
+         'Only one rollup per employee and month is allowed.'),
+    ]
+
+    # --- Reading ---
+    @api.model
+    def _get_rollup(self, employee_id, first_day, last_day):
+        """
+        Return ``(through, totals)`` for the precomputed part of a period, or None.
+
+        Only the months contiguous from ``first_day`` are used, so a month dropped
+        by ``_invalidate`` makes the rest of the period fall back to the live
+        computation. ``through`` is the last day covered by ``totals``.
+        """
+        rows = self.sudo().search_read([
+            ('employee_id', '=', employee_id),
+            ('period_start', '=', first_day),
+            ('first_day', '<=', last_day),
+        ], ['first_day', 'last_day', 'attendance_count', 'absent_count', 'absent_days', 'late_count', 'late_minutes'])
+
+        totals = {'attendanceCount': 0.0, 'absentCount': 0.0, 'absentDays': 0, 'lateCount': 0, 'lateMinutes': 0}
+        expected = first_day
+        for row in rows:
+            if row['first_day'] != expected or row['last_day'] > last_day:
+                break
+            totals['attendanceCount'] += row['attendance_count']
+            totals['absentCount'] += row['absent_count']
+            totals['absentDays'] += row['absent_days']
+            totals['lateCount'] += row['late_count']
+            totals['lateMinutes'] += row['late_minutes']
+            expected = row['last_day'] + timedelta(days=1)
+
+        if expected == first_day:
+            return None
+        return expected - timedelta(days=1), totals
+
+    # --- Maintenance ---
+    @api.model
+    def _invalidate(self, days_by_employee):
+        """Drop the rollups covering the given ``{employee_id: days}``; they are rebuilt by the next run."""
+        if not days_by_employee:
+            return
+        self.flush_model()
+        for employee_id, days in days_by_employee.items():
+            days = list(days)
+            self.env.cr.execute("""
+                DELETE FROM attendance_month_rollup r
+                 WHERE r.employee_id = %s
+                   AND EXISTS (SELECT 1 FROM unnest(%s::date[]) d WHERE d BETWEEN r.first_day AND r.last_day)
+            """, (employee_id, days))
+        self.invalidate_model()
+
+    @api.model
+    def _invalidate_range(self, employee_ids, first_day, last_day):
+        """Drop the rollups of the employees overlapping ``first_day``..``last_day``."""
+        if not employee_ids:
+            return
+        self.flush_model()
+        self.env.cr.execute("""
+            DELETE FROM attendance_month_rollup
+             WHERE employee_id = ANY(%s) AND first_day <= %s AND last_day >= %s
+        """, (list(employee_ids), last_day, first_day))
+        self.invalidate_model()
+
+    @api.model
+    def _compute_rollups(self, employee_ids, period_start, through, today):
+        """
+        Bring the rollups of the employees up to date for ``period_start``..``through``.
+
+        Complete months are kept; missing months and the month still in progress
+        are computed with one grouped aggregate per month for all employees.
+        Returns the number of month rows written.
+        """
+        Summary = self.env['attendance.day.summary'].sudo()
+        existing = {
+            (row.employee_id.id, row.first_day): row
+            for row in self.sudo().search([
+                ('employee_id', 'in', employee_ids),
+                ('period_start', '=', period_start),
+            ])
+        }
+
+        written = 0
+        to_create = []
+        for first, last in month_ranges(period_start, through):
+            stale = [
+                employee_id for employee_id in employee_ids
+                if (employee_id, first) not in existing or existing[(employee_id, first)].last_day != last
+            ]
+            if not stale:
+                continue
+            totals_by_employee = Summary._get_period_totals(stale, first, last, today)
+            for employee_id in stale:
+                totals = totals_by_employee[employee_id]
+                vals = {
+                    'last_day': last,
+                    'attendance_count': totals['attendanceCount'],
+                    'absent_count': totals['absentCount'],
+                    'absent_days': totals['absentDays'],
+                    'late_count': totals['lateCount'],
+                    'late_minutes': totals['lateMinutes'],
+                }
+                row = existing.get((employee_id, first))
+                if row:
+                    row.write(vals)
+                else:
+                    to_create.append(dict(vals, employee_id=employee_id, period_start=period_start, first_day=first))
+                written += 1
+        if to_create:
+            self.sudo().create(to_create)
+        return written
+
+    @api.model
+    def _get_rollup_window(self):
+        """Return ``(today, period_start, through)``: rollups cover the closed days of the fiscal period."""
+        today = to_local_date(fields.Datetime.now())
+        return today, fiscal_period_start(today), today - timedelta(days=1)
+
+    @api.model
+    def _cron_rebuild_rollups(self, batch_size=200):
+        """
+        Nightly precomputation of the fiscal-period rollups of every employee.
+
+        Employees are processed by id in batches, each committed on its own with
+        the progress stored in ``PROGRESS_PARAM``, so the run never holds one long
+        transaction and a run interrupted by a restart or timeout resumes after
+        the last committed batch.
+        """
+        today, period_start, through = self._get_rollup_window()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        Param = self.env['ir.config_parameter'].sudo()
+
+        # Rollups of previous fiscal periods are no longer read
+        self.sudo().search([('period_start', '<', period_start)]).unlink()
+        if through < period_start:
+            return True
+
+        progress = json.loads(Param.get_param(PROGRESS_PARAM) or '{}')
+        last_id = progress.get('last_employee_id', 0) if progress.get('date') == today.isoformat() else 0
+        if progress.get('done') and last_id:
+            return True
+
+        Employee = self.env['hr.employee'].sudo()
+        total = Employee.search_count([])
+        done = Employee.search_count([('id', '<=', last_id)])
+        if last_id:
+            _logger.info("Attendance rollups: resuming after employee %s (%s/%s)", last_id, done, total)
+
+        while True:
+            employee_ids = Employee.search([('id', '>', last_id)], order='id', limit=batch_size).ids
+            if not employee_ids:
+                break
+            written = self._compute_rollups(employee_ids, period_start, through, today)
+            last_id = employee_ids[-1]
+            done += len(employee_ids)
+            Param.set_param(PROGRESS_PARAM, json.dumps({'date': today.isoformat(), 'last_employee_id': last_id}))
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            _logger.info("Attendance rollups: %s/%s employees, %s months recomputed", done, total, written)
+
+        Param.set_param(PROGRESS_PARAM, json.dumps({'date': today.isoformat(), 'last_employee_id': last_id, 'done': True}))
+        return True
+
+    @api.model
+    def _rebuild(self, employee_ids):
+        """Recompute the rollups of some employees from scratch, e.g. after a data fix."""
+        today, period_start, through = self._get_rollup_window()
+        self.sudo().search([('employee_id', 'in', employee_ids)]).unlink()
+        if through >= period_start and employee_ids:
+            self._compute_rollups(employee_ids, period_start, through, today)
+            _logger.info("Attendance rollups rebuilt for %s employees", len(employee_ids))
+        return True
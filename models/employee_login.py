@@ -1,36 +1,261 @@
 from odoo import models, fields, api
+from odoo.service import server as odoo_server
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import partial
+import multiprocessing
+import os
+import secrets
+import threading
+import time
 import uuid
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha512"], deprecated="auto")
+# pbkdf2_sha512 rounds, overridable with the ``attendance_dashboard.pbkdf2_rounds``
+# system parameter; hashes made with another cost are upgraded at next login
+DEFAULT_PBKDF2_ROUNDS = 25000
+_pwd_contexts = {}
+
+# Bulk hashing (provisioning) is spread over this many processes, unless
+# overridden by the ``attendance_dashboard.hash_workers`` system parameter;
+# batches smaller than PARALLEL_HASH_MIN are hashed in-process
+PARALLEL_HASH_MIN = 16
+HASH_CHUNK_SIZE = 50
+
+# Tokens are valid for this many days unless overridden by the
+# ``attendance_dashboard.token_lifetime_days`` system parameter
+DEFAULT_TOKEN_LIFETIME_DAYS = 30
+
+# Single-use activation links of provisioned logins are valid for this many
+# hours unless overridden by ``attendance_dashboard.activation_lifetime_hours``
+DEFAULT_ACTIVATION_LIFETIME_HOURS = 72
+
+# In-process token -> (employee_id, expiry) cache
+TOKEN_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_SIZE = 10000
+_token_cache = {}
+_token_cache_lock = threading.Lock()
+
+
+def pwd_context_for(rounds):
+    """Return the CryptContext for a pbkdf2 cost (cached per cost)."""
+    context = _pwd_contexts.get(rounds)
+    if context is None:
+        # Pinning min/max rounds makes hashes of any other cost "need update"
+        context = _pwd_contexts[rounds] = CryptContext(
+            schemes=["pbkdf2_sha512"], deprecated="auto",
+            pbkdf2_sha512__default_rounds=rounds,
+            pbkdf2_sha512__min_rounds=rounds,
+            pbkdf2_sha512__max_rounds=rounds,
+        )
+    return context
+
+
+def hash_passwords(raw_passwords, rounds):
+    """Hash a list of passwords; runs in the worker processes of bulk hashing."""
+    context = pwd_context_for(rounds)
+    return [context.hash(raw_password) for raw_password in raw_passwords]
+
 
 class EmployeeLogin(models.Model):
     _name = 'employee.login'
     _description = 'Employee Login'
     
-    employee_number = fields.Many2one('hr.employee', required=True)
+    employee_number = fields.Many2one('hr.employee', required=True, index=True)
     password = fields.Char(required=True)
-    login_token = fields.Char(string='Login Token', readonly=True)
+    login_token = fields.Char(string='Login Token', readonly=True, index=True, copy=False)
+    token_expiry = fields.Datetime(string='Token Expiry', readonly=True, copy=False)
+    activation_token = fields.Char(string='Activation Token', readonly=True, index=True, copy=False)
+    activation_expiry = fields.Datetime(string='Activation Expiry', readonly=True, copy=False)
+
+    _sql_constraints = [
+        ('employee_number_uniq', 'unique(employee_number)', 'An employee can only have one login.'),
+        ('login_token_uniq', 'unique(login_token)', 'Login tokens must be unique.'),
+        ('activation_token_uniq', 'unique(activation_token)', 'Activation tokens must be unique.'),
+    ]
+
+    def _get_pbkdf2_rounds(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.pbkdf2_rounds', DEFAULT_PBKDF2_ROUNDS))
+
+    def _get_pwd_context(self):
+        """Return the CryptContext for the configured hashing cost."""
+        return pwd_context_for(self._get_pbkdf2_rounds())
 
     def _hash_password(self, raw_password):
-        return pwd_context.hash(raw_password)
+        return self._get_pwd_context().hash(raw_password)
 
     @api.model
-    def create(self, vals):
-        if vals.get('password'):
-            vals['password'] = self._hash_password(vals['password'])
+    def _hash_passwords(self, raw_passwords):
+        """
+        Hash many passwords at once, spread over a pool of processes.
+
+        pbkdf2 is CPU-bound, so threads would serialize on the GIL. The pool is
+        forked: the children only run :func:`hash_passwords` and never touch
+        the cursor or the registry inherited from this worker. Forking is only
+        safe from the single-threaded prefork workers (a lock held by another
+        thread would stay held in the children), so the threaded server and
+        the shell hash in-process.
+        """
+        rounds = self._get_pbkdf2_rounds()
+        workers = int(self.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.hash_workers', os.cpu_count() or 1))
+        prefork = isinstance(odoo_server.server, odoo_server.PreforkServer)
+        if not prefork or workers <= 1 or len(raw_passwords) < PARALLEL_HASH_MIN:
+            return hash_passwords(raw_passwords, rounds)
+        chunks = [raw_passwords[i:i + HASH_CHUNK_SIZE] for i in range(0, len(raw_passwords), HASH_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            return [hashed for chunk in executor.map(partial(hash_passwords, rounds=rounds), chunks)
+                    for hashed in chunk]
+
+    def _new_token_expiry(self):
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.token_lifetime_days', DEFAULT_TOKEN_LIFETIME_DAYS))
+        return fields.Datetime.now() + timedelta(days=days)
+
+    def _set_new_token(self, vals):
         if not vals.get('login_token'):
             vals['login_token'] = str(uuid.uuid4())
-        return super().create(vals)
+            vals['token_expiry'] = self._new_token_expiry()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('password'):
+                vals['password'] = self._hash_password(vals['password'])
+            self._set_new_token(vals)
+        return super().create(vals_list)
+
+    @api.model
+    def _create_hashed(self, vals_list):
+        """Create logins whose ``password`` values are already hashed (bulk provisioning)."""
+        for vals in vals_list:
+            self._set_new_token(vals)
+        return super().create(vals_list)
 
     def write(self, vals):
         if vals.get('password'):
             vals['password'] = self._hash_password(vals['password'])
+            # Once the employee has a password, a pending activation link is void
+            vals.setdefault('activation_token', False)
+            vals.setdefault('activation_expiry', False)
+        if 'login_token' in vals or 'token_expiry' in vals:
+            self._clear_token_cache()
         return super().write(vals)
 
+    def unlink(self):
+        self._clear_token_cache()
+        return super().unlink()
+
     def check_password(self, raw_password):
-        """Compare the hashed DB password with raw input using pbkdf2_sha512."""
+        """
+        Compare the hashed DB password with raw input using pbkdf2_sha512.
+
+        When the stored hash no longer matches the configured cost it is
+        re-hashed with the current policy on successful verification.
+        """
         try:
-            return pwd_context.verify(raw_password, self.password)
+            valid, new_hash = self._get_pwd_context().verify_and_update(raw_password, self.password)
         except Exception:
             return False
+        if valid and new_hash:
+            # Already hashed: bypass the hashing done in write()
+            super(EmployeeLogin, self.sudo()).write({'password': new_hash})
+        return valid
+
+    # --- Token handling ---
+    def _rotate_token(self):
+        """Issue a fresh login token with a new expiry and return it."""
+        self.ensure_one()
+        token = str(uuid.uuid4())
+        self.write({'login_token': token, 'token_expiry': self._new_token_expiry()})
+        return token
+
+    def action_revoke_token(self):
+        """Revoke the current token; the APK has to log in again."""
+        self.write({'login_token': False, 'token_expiry': False})
+        return True
+
+    # --- Activation ---
+    @api.model
+    def _new_activation_vals(self):
+        """Return the values of a fresh single-use activation token."""
+        hours = int(self.env['ir.config_parameter'].sudo().get_param(
+            'attendance_dashboard.activation_lifetime_hours', DEFAULT_ACTIVATION_LIFETIME_HOURS))
+        return {
+            'activation_token': secrets.token_urlsafe(32),
+            'activation_expiry': fields.Datetime.now() + timedelta(hours=hours),
+        }
+
+    @api.model
+    def _get_login_by_activation_token(self, token):
+        """Return the login of a pending, unexpired activation token, or an empty recordset."""
+        if not token:
+            return self.browse()
+        return self.sudo().search([
+            ('activation_token', '=', token),
+            ('activation_expiry', '>', fields.Datetime.now()),
+        ], limit=1)
+
+    @api.model
+    def _redeem_activation_token(self, token, raw_password):
+        """
+        Set the password of the login owning ``token`` and void the token.
+
+        The token is cleared with a single conditional UPDATE, so of two
+        concurrent redemptions only one gets the login; the other gets an
+        empty recordset, as for an unknown or expired token.
+        """
+        if not token or not raw_password:
+            return self.browse()
+        self.env.cr.execute("""
+            UPDATE employee_login
+               SET activation_token = NULL, activation_expiry = NULL
+             WHERE activation_token = %s AND activation_expiry > (now() AT TIME ZONE 'UTC')
+         RETURNING id
+        """, [token])
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        login = self.sudo().browse(row[0])
+        login.invalidate_recordset(['activation_token', 'activation_expiry'])
+        login.write({'password': raw_password})
+        return login
+
+    def _clear_token_cache(self):
+        tokens = {rec.login_token for rec in self if rec.login_token}
+        with _token_cache_lock:
+            for token in tokens:
+                _token_cache.pop(token, None)
+
+    @api.model
+    def _get_employee_by_token(self, token):
+        """
+        Return the employee owning a valid, unexpired token, or an empty recordset.
+
+        Tokens without an expiry count as expired. Lookups are cached in-process
+        for ``TOKEN_CACHE_TTL`` seconds. Rotating or revoking a token drops it
+        from this worker's cache immediately; other workers stop accepting it
+        once their entry expires.
+        """
+        Employee = self.env['hr.employee'].sudo()
+        if not token:
+            return Employee
+        now = time.time()
+        with _token_cache_lock:
+            cached = _token_cache.get(token)
+        if cached and cached[2] > now:
+            employee_id, expiry = cached[0], cached[1]
+        else:
+            login_record = self.sudo().search([('login_token', '=', token)], limit=1)
+            employee_id = login_record.employee_number.id if login_record else False
+            expiry = login_record.token_expiry if login_record else False
+            with _token_cache_lock:
+                if len(_token_cache) >= TOKEN_CACHE_SIZE:
+                    _token_cache.clear()
+                _token_cache[token] = (employee_id, expiry, now + TOKEN_CACHE_TTL)
+
+        if not employee_id or not expiry or expiry < fields.Datetime.now():
+            return Employee
+        return Employee.browse(employee_id)
@@ -0,0 +1,27 @@
+from odoo import models, fields, api, tools
+from datetime import timedelta
+
+# Failures are only counted within windows of minutes; older rows are dropped
+FAILURE_RETENTION = timedelta(days=1)
+
+
+class EmployeeLoginFailure(models.Model):
+    _name = 'employee.login.failure'
+    _description = 'Failed Employee Login'
+    _log_access = False
+
+    scope = fields.Selection([('account', 'Account'), ('ip', 'IP Address')], required=True)
+    key = fields.Char(required=True)
+    failed_at = fields.Datetime(required=True)
+
+    def init(self):
+        # Sliding-window counts of one key (controllers/login_throttle.py)
+        tools.create_index(
+            self._cr, 'employee_login_failure_scope_key_failed_at_index',
+            self._table, ['scope', 'key', 'failed_at'])
+
+    @api.autovacuum
+    def _gc_failures(self):
+        self.env.cr.execute(
+            "DELETE FROM employee_login_failure WHERE failed_at < %s",
+            [fields.Datetime.now() - FAILURE_RETENTION])
@@ -0,0 +1,104 @@
+from odoo import models, fields, api, tools
+from datetime import timedelta
+from .attendance_day_summary import LATE_SEVERITY, late_severity, to_local, to_local_date
+
+# hr.attendance fields that affect the day summaries
+SUMMARY_FIELDS = {'employee_id', 'check_in', 'check_out', 'display_late_minutes'}
+
+
+def _late_minutes_depends(model):
+    # display_late_minutes comes from an optional module; without it the
+    # lateness is measured from the scheduled start of the employee's shift
+    return ['display_late_minutes'] if 'display_late_minutes' in model._fields else ['employee_id', 'check_in']
+
+
+class HrAttendance(models.Model):
+    _inherit = 'hr.attendance'
+
+    check_in_local_date = fields.Date(
+        string='Check In Date (Myanmar)', compute='_compute_local_dates', store=True, index=True)
+    check_out_local_date = fields.Date(
+        string='Check Out Date (Myanmar)', compute='_compute_local_dates', store=True, index=True)
+    late_minutes = fields.Integer(
+        string='Late Minutes', compute='_compute_late_minutes', store=True, index=True)
+    late_severity = fields.Selection(
+        LATE_SEVERITY, string='Late Severity', compute='_compute_late_minutes', store=True)
+
+    def init(self):
+        # Per-employee day lookups (calendar, summaries, exports)
+        tools.create_index(
+            self._cr, 'hr_attendance_employee_check_in_local_date_index',
+            self._table, ['employee_id', 'check_in_local_date'])
+
+    @api.depends('check_in', 'check_out')
+    def _compute_local_dates(self):
+        for att in self:
+            att.check_in_local_date = to_local_date(att.check_in) if att.check_in else False
+            att.check_out_local_date = to_local_date(att.check_out) if att.check_out else False
+
+    @api.depends(_late_minutes_depends)
+    def _compute_late_minutes(self):
+        has_display_late = 'display_late_minutes' in self._fields
+        for att in self:
+            if has_display_late:
+                att.late_minutes = att._parse_display_late_minutes()
+            else:
+                att.late_minutes = att._get_scheduled_late_minutes()
+            att.late_severity = late_severity(att.late_minutes)
+
+    def _get_scheduled_late_minutes(self):
+        """Minutes between the scheduled start of the check-in day and the check-in."""
+        if not self.check_in or not self.employee_id:
+            return 0
+        check_in = to_local(self.check_in)
+        rules = self.env['attendance.day.summary'].sudo()._get_schedule(self.employee_id).day_rules(check_in.date())
+        if rules.start_hour is None:
+            return 0
+        start = check_in.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(hours=rules.start_hour)
+        return max(int((check_in - start).total_seconds() // 60), 0)
+
+    def _parse_display_late_minutes(self):
+        """Convert ``display_late_minutes`` (float hours or "HH:MM") to minutes."""
+        display_late = getattr(self, 'display_late_minutes', "00:00")
+        if not display_late or display_late == "00:00":
+            return 0
+        try:
+            if isinstance(display_late, float):
+                hours = int(display_late)
+                minutes = int((display_late - hours) * 60)
+            else:
+                hh, mm = display_late.split(":")
+                hours, minutes = int(hh), int(mm)
+        except (ValueError, TypeError):
+            return 0
+        return max(hours * 60 + minutes, 0)
+
+    def _get_summary_keys(self):
+        """Return the ``(employee_id, local date)`` pairs these attendances touch."""
+        keys = set()
+        for att in self:
+            for local_date in (att.check_in_local_date, att.check_out_local_date):
+                if local_date:
+                    keys.add((att.employee_id.id, local_date))
+        return keys
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['attendance.day.summary']._refresh_days(records._get_summary_keys(), notify=True)
+        return records
+
+    def write(self, vals):
+        if not SUMMARY_FIELDS.intersection(vals):
+            return super().write(vals)
+        keys = self._get_summary_keys()
+        res = super().write(vals)
+        keys |= self._get_summary_keys()
+        self.env['attendance.day.summary']._refresh_days(keys, notify=True)
+        return res
+
+    def unlink(self):
+        keys = self._get_summary_keys()
+        res = super().unlink()
+        self.env['attendance.day.summary']._refresh_days(keys, notify=True)
+        return res
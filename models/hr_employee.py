@@ -0,0 +1,15 @@
+from odoo import models
+
+# hr.employee fields that change the employee's working schedule
+SCHEDULE_FIELDS = {'resource_calendar_id', 'resource_calendar_ids'}
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if SCHEDULE_FIELDS.intersection(vals):
+            # Weekends, holidays and scheduled-start lateness follow the new shift
+            self.env['attendance.day.summary'].sudo()._reclassify(self.ids)
+        return res
@@ -0,0 +1,18 @@
+from odoo import models
+from odoo.http import request
+from odoo.addons.bus.websocket import wsrequest
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Subscribe dashboard sessions to their employee, for the day-update notifications."""
+        channels = super()._build_bus_channel_list(channels)
+        req = request or wsrequest
+        employee_id = req.session.get('employee_number')
+        if employee_id:
+            employee = self.env['hr.employee'].sudo().browse(employee_id)
+            if employee.exists():
+                channels.append(employee)
+        return channels
@@ -0,0 +1,223 @@
+from odoo import models, api, tools
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+import pytz
+
+MYANMAR_TZ = pytz.timezone('Asia/Yangon')
+
+# resource.calendar fields that change the compiled rules; changes to the lines
+# (attendance_ids) are caught by resource.calendar.attendance itself
+CALENDAR_FIELDS = {'two_weeks_calendar', 'company_id', 'active'}
+
+# cr.precommit data key of the calendars waiting for a reclassification
+RULES_CHANGED_KEY = 'attendance_dashboard.rules_changed'
+
+DayRules = namedtuple('DayRules', ['hours', 'start_hour', 'is_holiday'])
+
+# Used for employees without a working schedule: Monday to Friday, 9:00 - 18:00
+DEFAULT_RULES = {
+    'two_weeks': False,
+    'hours': {(False, weekday): 8.0 for weekday in range(5)},
+    'start': {(False, weekday): 9.0 for weekday in range(5)},
+    'holidays': frozenset(),
+}
+
+
+def _week_type(day):
+    # Same parity as resource.calendar.attendance.get_week_type
+    return str((day.toordinal() - 1) // 7 % 2)
+
+
+class WorkSchedule:
+    """
+    Working-day lookup of one employee, merged from the compiled rules of their
+    calendars: a day is worked if any calendar works it and is not a holiday in it.
+    """
+
+    def __init__(self, compiled_rules):
+        self.compiled_rules = compiled_rules or [DEFAULT_RULES]
+
+    def day_rules(self, day):
+        """Return the scheduled hours, the earliest start hour and the holiday flag of a day."""
+        hours, start_hour, scheduled = 0.0, None, False
+        for rules in self.compiled_rules:
+            key = (_week_type(day) if rules['two_weeks'] else False, day.weekday())
+            rule_hours = rules['hours'].get(key, 0.0)
+            if not rule_hours:
+                continue
+            scheduled = True
+            if day in rules['holidays']:
+                continue
+            hours = max(hours, rule_hours)
+            start_hour = min(start_hour, rules['start'][key]) if start_hour is not None else rules['start'][key]
+        return DayRules(hours, start_hour, scheduled and not hours)
+
+    def count_working_days(self, first_day, last_day):
+        """Number of scheduled, non-holiday days in ``first_day``..``last_day`` (inclusive)."""
+        count = 0
+        day = first_day
+        while day <= last_day:
+            if self.day_rules(day).hours:
+                count += 1
+            day += timedelta(days=1)
+        return count
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    @tools.ormcache('self.id', 'self.write_date')
+    def _get_compiled_rules(self):
+        """
+        Compile the calendar into plain lookup tables, cached per calendar version.
+
+        The cache is keyed on the calendar's ``write_date``, which
+        ``_rules_changed`` bumps whenever its lines or holidays change, so
+        every worker picks up the new rules without clearing the registry cache.
+
+        ``hours`` and ``start`` map ``(week type, weekday)`` to the scheduled hours
+        and the first start hour; ``holidays`` holds the Myanmar-local dates of the
+        global leaves of the calendar and the company-wide public holidays.
+        """
+        self.ensure_one()
+        hours, start = {}, {}
+        for line in self.attendance_ids:
+            if line.display_type or line.day_period == 'lunch':
+                continue
+            key = (line.week_type if self.two_weeks_calendar else False, int(line.dayofweek))
+            hours[key] = hours.get(key, 0.0) + line.hour_to - line.hour_from
+            start[key] = min(start.get(key, 24.0), line.hour_from)
+
+        leaves = self.env['resource.calendar.leaves'].sudo().search([
+            ('resource_id', '=', False),
+            '|', ('calendar_id', '=', self.id), ('calendar_id', '=', False),
+            '|', ('company_id', '=', False), ('company_id', '=', self.company_id.id),
+        ])
+        holidays = set()
+        for leave in leaves:
+            day = pytz.utc.localize(leave.date_from).astimezone(MYANMAR_TZ).date()
+            last_day = pytz.utc.localize(leave.date_to - timedelta(seconds=1)).astimezone(MYANMAR_TZ).date()
+            while day <= last_day:
+                holidays.add(day)
+                day += timedelta(days=1)
+
+        return {
+            'two_weeks': self.two_weeks_calendar,
+            'hours': hours,
+            'start': start,
+            'holidays': frozenset(holidays),
+        }
+
+    def _rules_changed(self, first_day=None, last_day=None):
+        """
+        Bump the calendars' version and queue the reclassification of the days
+        of the employees on these calendars.
+
+        The reclassification runs once per calendar, just before the transaction
+        commits, however many of its lines or holidays changed in between.
+        """
+        if not self:
+            return
+        # clock_timestamp(): each change gets a new version, even within one transaction
+        self.flush_recordset(['write_date'])
+        self.env.cr.execute("""
+            UPDATE resource_calendar SET write_date = clock_timestamp() AT TIME ZONE 'UTC' WHERE id IN %s
+        """, [tuple(self.ids)])
+        self.invalidate_recordset(['write_date'])
+
+        first_day, last_day = self.env['attendance.day.summary']._get_reclassify_range(first_day, last_day)
+        pending = self.env.cr.precommit.data.setdefault(RULES_CHANGED_KEY, {})
+        if not pending:
+            self.env.cr.precommit.add(self.env['resource.calendar'].sudo()._reclassify_changed_calendars)
+        for calendar_id in self.ids:
+            if calendar_id in pending:
+                pending_first, pending_last = pending[calendar_id]
+                pending[calendar_id] = (min(first_day, pending_first), max(last_day, pending_last))
+            else:
+                pending[calendar_id] = (first_day, last_day)
+
+    def _reclassify_changed_calendars(self):
+        """Precommit hook: reclassify the employees of the calendars queued by ``_rules_changed``."""
+        pending = self.env.cr.precommit.data.pop(RULES_CHANGED_KEY, {})
+        calendar_ids_by_range = defaultdict(list)
+        for calendar_id, day_range in pending.items():
+            calendar_ids_by_range[day_range].append(calendar_id)
+        Summary = self.env['attendance.day.summary'].sudo()
+        for (first_day, last_day), calendar_ids in calendar_ids_by_range.items():
+            employees = Summary._get_calendar_employees(self.browse(calendar_ids).exists())
+            if employees:
+                Summary._reclassify(employees.ids, first_day, last_day)
+        self.env.flush_all()
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CALENDAR_FIELDS.intersection(vals):
+            self._rules_changed()
+        return res
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.calendar_id._rules_changed()
+        return records
+
+    def write(self, vals):
+        calendars = self.calendar_id
+        res = super().write(vals)
+        (calendars | self.calendar_id)._rules_changed()
+        return res
+
+    def unlink(self):
+        calendars = self.calendar_id
+        res = super().unlink()
+        calendars._rules_changed()
+        return res
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    def _get_holiday_scope(self):
+        """Return ``(calendars, first_day, last_day)`` affected by the global leaves among these, or None."""
+        holidays = self.filtered(lambda leave: not leave.resource_id and leave.date_from and leave.date_to)
+        if not holidays:
+            return None
+        calendars = holidays.calendar_id
+        if not all(holidays.mapped('calendar_id')):
+            # Public holidays without a calendar apply to every calendar of the company
+            companies = holidays.company_id
+            domain = [('company_id', 'in', companies.ids + [False])] if companies else []
+            calendars |= self.env['resource.calendar'].sudo().search(domain)
+        first_day = pytz.utc.localize(min(holidays.mapped('date_from'))).astimezone(MYANMAR_TZ).date()
+        last_day = pytz.utc.localize(max(holidays.mapped('date_to'))).astimezone(MYANMAR_TZ).date()
+        return calendars, first_day, last_day
+
+    @api.model
+    def _holidays_changed(self, *scopes):
+        scopes = [scope for scope in scopes if scope]
+        if not scopes:
+            return
+        calendars = self.env['resource.calendar'].union(*(scope[0] for scope in scopes))
+        calendars._rules_changed(min(scope[1] for scope in scopes), max(scope[2] for scope in scopes))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._holidays_changed(records._get_holiday_scope())
+        return records
+
+    def write(self, vals):
+        before = self._get_holiday_scope()
+        res = super().write(vals)
+        self._holidays_changed(before, self._get_holiday_scope())
+        return res
+
+    def unlink(self):
+        before = self._get_holiday_scope()
+        res = super().unlink()
+        self._holidays_changed(before)
+        return res
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import os
+import threading
+
+# Maximum number of (employee, period) entries kept per worker process
+STATS_CACHE_SIZE = 2048
+
+
+class StatsCache:
+    """
+    Bounded, per-process LRU cache of computed dashboard periods.
+
+    Entries are keyed by ``(dbname, employee_id, first_day, last_day)`` and carry
+    the employee's summary stamp at computation time. A lookup only hits when
+    the stamp read from the database still matches, so a change committed by
+    another worker invalidates the entry as well; changes made in this worker
+    also drop the employee's entries eagerly through :meth:`invalidate`.
+    """
+
+    def __init__(self, size=STATS_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, stamp):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def set(self, key, stamp, value):
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, dbname, employee_ids):
+        employee_ids = set(employee_ids)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == dbname and key[1] in employee_ids]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                # Counters are per process: tell the workers apart
+                'pid': os.getpid(),
+                'size': len(self._entries),
+                'max_size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+stats_cache = StatsCache()
@@ -1,128 +1,47 @@
-function showDayDetails(element) {
-    const modal = document.getElementById('day-details-modal');
-    const dateElement = document.getElementById('modal-date');
-    const shiftElement = document.getElementById('modal-shift');
-    const checkinElement = document.getElementById('modal-checkin');
-    const checkoutElement = document.getElementById('modal-checkout');
-    const lateElement = document.getElementById('modal-late');
-    const statusElement = document.getElementById('modal-status');
-    const attendanceElement = document.getElementById('modal-attendance');
-
-    const date = element.getAttribute('data-date');
-    const checkin = element.getAttribute('data-checkin');
-    const checkout = element.getAttribute('data-checkout');
-    const late = element.getAttribute('data-late');
-    const shift = element.getAttribute('data-shift');
-    let status = element.getAttribute('data-status');
-    const attendanceFraction = parseFloat(element.getAttribute('data-attendance-fraction') || '1');
-
-    // Handle partial attendance
-    if (attendanceFraction === 0.5) {
-        status = 'partial';
-    }
-
-    if (dateElement) dateElement.textContent = date;
-    if (shiftElement) shiftElement.textContent = shift;
-    if (checkinElement) checkinElement.textContent = checkin || 'Not recorded';
-    if (checkoutElement) checkoutElement.textContent = checkout || 'Not recorded';
-    if (lateElement) lateElement.textContent = late + ' minutes';
-    if (attendanceElement) attendanceElement.textContent = attendanceFraction.toFixed(1);
-
-    if (statusElement) {
-        statusElement.textContent = status.charAt(0).toUpperCase() + status.slice(1);
-        statusElement.className = 'agb-status-badge agb-status-' + status;
-    }
-
-    if (modal) modal.classList.add('show');
-}
-
-
-// Close modal function
-function closeDayDetails() {
-    const modal = document.getElementById('day-details-modal');
-    if (modal) {
-        modal.classList.remove('show');
+// The day details modal, the notifications and pull-to-refresh live in the
+// assets_portal_lazy bundle: the page only declares it (script tags with a
+// data-src) and it is fetched once the page is idle, or on first use
+(function() {
+    let loading = null;
+
+    function loadLazyAssets() {
+        if (!loading) {
+            const nodes = Array.from(document.querySelectorAll('script[data-src]'));
+            loading = nodes.reduce((previous, node) => previous.then(() => new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = node.dataset.src;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            })), Promise.resolve());
+        }
+        return loading;
     }
-}
-
 
-// Close modal function
-function closeDayDetails() {
-    const modal = document.getElementById('day-details-modal');
-    if (modal) {
-        modal.classList.remove('show');
+    // Placeholder that loads the bundle, then calls the real function it defines
+    function deferred(name) {
+        const placeholder = function(...args) {
+            return loadLazyAssets().then(() => {
+                if (window[name] !== placeholder) {
+                    return window[name](...args);
+                }
+            });
+        };
+        return placeholder;
     }
-}
-
-
-// Close modal function
-function closeDayDetails() {
-    const modal = document.getElementById('day-details-modal');
-    if (modal) modal.classList.remove('show');
-}
-
-
-// Close day details modal
-function closeDayDetails() {
-    const modal = document.getElementById('day-details-modal');
-    if (modal) {
-        modal.classList.remove('show');
-    }
-}
-
-function showLeaveNotification() {
-    showNotification('Leave management feature coming soon!', 'info');
-}
 
-// Generic notification function
-function showNotification(message, type = 'info') {
-    const container = document.getElementById('notification-container') || createNotificationContainer();
-    
-    const notification = document.createElement('div');
-    notification.className = `agb-notification ${type}`;
-    notification.textContent = message;
-    
-    container.appendChild(notification);
-    
-    // Trigger animation
-    setTimeout(() => {
-        notification.classList.add('show');
-    }, 100);
-    
-    // Auto remove after 3 seconds
-    setTimeout(() => {
-        notification.classList.remove('show');
-        setTimeout(() => {
-            if (notification.parentNode) {
-                notification.parentNode.removeChild(notification);
-            }
-        }, 300);
-    }, 3000);
-}
-
-// Create notification container if it doesn't exist
-function createNotificationContainer() {
-    const container = document.createElement('div');
-    container.id = 'notification-container';
-    container.className = 'agb-notification-container';
-    document.body.appendChild(container);
-    return container;
-}
+    ['showDayDetails', 'closeDayDetails', 'showLeaveNotification', 'showNotification'].forEach(name => {
+        window[name] = deferred(name);
+    });
 
-// Close modal when clicking outside
-document.addEventListener('click', function(event) {
-    const modal = document.getElementById('day-details-modal');
-    if (modal && event.target === modal) {
-        closeDayDetails();
-    }
-});
-
-// Close modal with Escape key
-document.addEventListener('keydown', function(event) {
-    if (event.key === 'Escape') {
-        closeDayDetails();
-    }
-});
+    window.addEventListener('load', function() {
+        if ('requestIdleCallback' in window) {
+            window.requestIdleCallback(loadLazyAssets);
+        } else {
+            setTimeout(loadLazyAssets, 1000);
+        }
+    });
+})();
 
 // Initialize when DOM is loaded
 document.addEventListener('DOMContentLoaded', function() {
@@ -159,73 +78,534 @@ function calculateWorkingHours(checkin, checkout) {
     return Math.max(0, diffHours);
 }
 
+
+
+
+// Calendar navigation without page reloads
 (function() {
-    let startY = 0;
-    let currentY = 0;
-    let isPulling = false;
-    const threshold = 60; // pixels to trigger refresh
-
-    // Create refresh icon
-    let refreshIcon = document.getElementById('pull-refresh-icon');
-    if (!refreshIcon) {
-        refreshIcon = document.createElement('div');
-        refreshIcon.id = 'pull-refresh-icon';
-        refreshIcon.innerHTML = '<i class="fa fa-spinner fa-spin"></i>';
-        document.body.appendChild(refreshIcon);
-    }
-
-    function touchStartHandler(e) {
-        if (window.scrollY === 0) { // only at top
-            startY = e.touches[0].clientY;
-            isPulling = true;
-            refreshIcon.style.top = '20px';
-            refreshIcon.style.opacity = '0';
-        }
-    }
-
-    function touchMoveHandler(e) {
-        if (!isPulling) return;
-        currentY = e.touches[0].clientY;
-        let deltaY = currentY - startY;
-
-        if (deltaY > 0) { // pulling down
-            refreshIcon.style.display = 'block';
-            refreshIcon.style.top = `${20 + deltaY / 2}px`;
-            refreshIcon.style.opacity = Math.min(deltaY / threshold, 1);
-
-            if (deltaY > threshold) {
-                refreshIcon.classList.add('ready'); // optional styling
-            } else {
-                refreshIcon.classList.remove('ready');
+    const STORAGE_PREFIX = 'agb-calendar:';
+    const memoryCache = new Map();   // "year-month" -> month data
+    const inflight = new Map();      // "year-month" -> Promise
+
+    function getContainer() {
+        return document.getElementById('agb-calendar');
+    }
+
+    function monthKey(year, month) {
+        return `${year}-${month}`;
+    }
+
+    function storageKey(container, year, month) {
+        return `${STORAGE_PREFIX}${container.dataset.employeeId}:${monthKey(year, month)}`;
+    }
+
+    // Past months no longer change within a fiscal period
+    function isPastMonth(data) {
+        const [todayYear, todayMonth] = data.today.split('-').map(Number);
+        return data.year < todayYear || (data.year === todayYear && data.month < todayMonth);
+    }
+
+    function readStored(container, year, month) {
+        try {
+            const entry = JSON.parse(localStorage.getItem(storageKey(container, year, month)));
+            if (entry && entry.fiscal_start === container.dataset.fiscalStart) {
+                return entry;
+            }
+        } catch (e) {
+            // Storage unavailable or corrupted: fall back to the network
+        }
+        return null;
+    }
+
+    function writeStored(container, data) {
+        try {
+            localStorage.setItem(storageKey(container, data.year, data.month), JSON.stringify(data));
+        } catch (e) {
+            // Quota exceeded or private mode: memory cache only
+        }
+    }
+
+    // Drop months cached for a previous fiscal period
+    function pruneStored(container) {
+        try {
+            for (let i = localStorage.length - 1; i >= 0; i--) {
+                const key = localStorage.key(i);
+                if (!key || !key.startsWith(STORAGE_PREFIX)) continue;
+                const entry = JSON.parse(localStorage.getItem(key));
+                if (!entry || entry.fiscal_start !== container.dataset.fiscalStart) {
+                    localStorage.removeItem(key);
+                }
             }
+        } catch (e) {
+            // Ignore storage errors
         }
     }
 
-    function touchEndHandler() {
-        if (!isPulling) return;
-        let deltaY = currentY - startY;
-        if (deltaY > threshold) {
-            // Trigger reload
-            refreshIcon.innerHTML = '<i class="fa fa-spinner fa-spin"></i>';
-            setTimeout(() => {
-                window.location.reload();
-            }, 200);
+    function loadMonth(year, month) {
+        const key = monthKey(year, month);
+        if (memoryCache.has(key)) {
+            return Promise.resolve(memoryCache.get(key));
+        }
+        const container = getContainer();
+        const stored = readStored(container, year, month);
+        if (stored) {
+            memoryCache.set(key, stored);
+            return Promise.resolve(stored);
+        }
+        if (inflight.has(key)) {
+            return inflight.get(key);
+        }
+
+        const request = fetch(`/attendance/api/calendar?year=${year}&month=${month}`, {credentials: 'same-origin'})
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                // The current month changes as the day goes on: keep it only in memory
+                memoryCache.set(key, data);
+                if (isPastMonth(data)) {
+                    writeStored(container, data);
+                }
+                return data;
+            })
+            .catch(error => {
+                // Offline: fall back to the days kept by the sync store
+                const stored = window.agbStoredMonth && window.agbStoredMonth(year, month);
+                if (stored) return stored;
+                throw error;
+            })
+            .finally(() => inflight.delete(key));
+        inflight.set(key, request);
+        return request;
+    }
+
+    function prefetch(months) {
+        const run = () => months.forEach(m => loadMonth(m.year, m.month).catch(() => {}));
+        if ('requestIdleCallback' in window) {
+            window.requestIdleCallback(run);
         } else {
-            // Hide icon
-            refreshIcon.style.display = 'none';
+            setTimeout(run, 300);
         }
-        isPulling = false;
     }
 
-    document.addEventListener('touchstart', touchStartHandler, {passive: true});
-    document.addEventListener('touchmove', touchMoveHandler, {passive: true});
-    document.addEventListener('touchend', touchEndHandler);
+    function renderDay(data) {
+        const cell = document.createElement('div');
+        const classes = ['agb-calendar-day'];
+        if (data.is_weekend) classes.push('agb-calendar-weekend');
+        if (data.attendance_fraction === 1) classes.push('agb-calendar-present');
+        if (data.attendance_fraction === 0.5) classes.push('agb-calendar-partial');
+        if (data.attendance_fraction === 0 && !data.is_weekend) classes.push('agb-calendar-absent');
+        if (data.is_today) classes.push('agb-calendar-today');
+        if (data.is_future) classes.push('agb-calendar-future');
+        cell.className = classes.join(' ');
+
+        cell.setAttribute('data-date', data.formatted_date);
+        cell.setAttribute('data-checkin', data.check_in_time || 'Not recorded');
+        cell.setAttribute('data-checkout', data.check_out_time || 'Not recorded');
+        cell.setAttribute('data-late', data.is_late ? data.late_minutes : 0);
+        cell.setAttribute('data-shift', data.shift_name);
+        cell.setAttribute('data-status', data.status);
+        cell.setAttribute('data-attendance-fraction', data.attendance_fraction);
+        if (!data.is_future) {
+            cell.addEventListener('click', () => showDayDetails(cell));
+        }
+
+        const number = document.createElement('span');
+        number.className = 'agb-day-number';
+        number.textContent = data.day;
+        cell.appendChild(number);
+
+        if (!data.is_weekend) {
+            const dots = document.createElement('div');
+            dots.className = 'agb-attendance-dots';
+            [data.has_check_in, data.has_check_out].forEach(present => {
+                const dot = document.createElement('div');
+                dot.className = 'agb-attendance-dot ' + (present ? 'agb-dot-present' : 'agb-dot-absent');
+                dots.appendChild(dot);
+            });
+            cell.appendChild(dots);
+        }
+        return cell;
+    }
+
+    function renderMonth(data) {
+        const container = getContainer();
+        const body = document.getElementById('agb-calendar-body');
+        const title = document.getElementById('agb-calendar-title');
+        const prev = document.getElementById('agb-calendar-prev');
+        const next = document.getElementById('agb-calendar-next');
+
+        const fragment = document.createDocumentFragment();
+        const firstDay = new Date(data.year, data.month - 1, 1).getDay();  // Sunday first
+        for (let i = 0; i < firstDay; i++) {
+            const empty = document.createElement('div');
+            empty.className = 'agb-calendar-day agb-calendar-day-empty';
+            fragment.appendChild(empty);
+        }
+        data.days.forEach(day => fragment.appendChild(renderDay(day)));
+        body.replaceChildren(fragment);
+
+        title.textContent = `${data.month_name} ${data.year}`;
+        prev.dataset.year = data.prev_month.year;
+        prev.dataset.month = data.prev_month.month;
+        next.dataset.year = data.next_month.year;
+        next.dataset.month = data.next_month.month;
+        container.dataset.year = data.year;
+        container.dataset.month = data.month;
+    }
+
+    function showMonth(year, month, pushHistory) {
+        return loadMonth(year, month).then(data => {
+            renderMonth(data);
+            if (pushHistory) {
+                history.pushState({year, month}, '', `/attendance/calendar?year=${year}&month=${month}`);
+            }
+            prefetch([data.prev_month, data.next_month]);
+        });
+    }
+
+    function navigateCalendar(button) {
+        const year = parseInt(button.dataset.year, 10);
+        const month = parseInt(button.dataset.month, 10);
+        showMonth(year, month, true).catch(() => {
+            // Offline or API error: fall back to the server-rendered page
+            window.location.href = `/attendance/calendar?year=${year}&month=${month}`;
+        });
+    }
+
+    window.addEventListener('popstate', function(event) {
+        if (event.state && getContainer()) {
+            showMonth(event.state.year, event.state.month, false).catch(() => window.location.reload());
+        }
+    });
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const container = getContainer();
+        if (!container) return;
+        const year = parseInt(container.dataset.year, 10);
+        const month = parseInt(container.dataset.month, 10);
+        history.replaceState({year, month}, '');
+        pruneStored(container);
+        prefetch(['agb-calendar-prev', 'agb-calendar-next'].map(id => {
+            const button = document.getElementById(id);
+            return {year: parseInt(button.dataset.year, 10), month: parseInt(button.dataset.month, 10)};
+        }));
+    });
+
+    // Drop the cached months of the given ISO dates and redraw the shown month if it is one of them
+    function refreshDays(dates) {
+        const container = getContainer();
+        if (!container) return Promise.resolve();
+        const months = new Map(dates.map(isoDate => {
+            const [year, month] = isoDate.split('-').map(Number);
+            return [monthKey(year, month), {year, month}];
+        }));
+        months.forEach(({year, month}, key) => {
+            memoryCache.delete(key);
+            try {
+                localStorage.removeItem(storageKey(container, year, month));
+            } catch (e) {
+                // Ignore storage errors
+            }
+        });
+        const shown = monthKey(parseInt(container.dataset.year, 10), parseInt(container.dataset.month, 10));
+        const current = months.get(shown);
+        return current ? loadMonth(current.year, current.month).then(renderMonth) : Promise.resolve();
+    }
+
+    window.navigateCalendar = navigateCalendar;
+    window.agbRefreshCalendarDays = refreshDays;
+})();
+
+// Offline store: the calendar days and stats of the fiscal period, kept in sync
+// with /attendance/api/sync so the pages open with the last known data offline
+(function() {
+    const STORAGE_PREFIX = 'agb-sync:';
+    let syncing = null;
+
+    function getEmployeeId() {
+        const node = document.querySelector('[data-employee-id]');
+        return node ? node.dataset.employeeId : null;
+    }
+
+    function readStore() {
+        try {
+            return JSON.parse(localStorage.getItem(STORAGE_PREFIX + getEmployeeId())) || null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    function writeStore(store) {
+        try {
+            localStorage.setItem(STORAGE_PREFIX + getEmployeeId(), JSON.stringify(store));
+        } catch (e) {
+            // Quota exceeded or private mode: the pages stay online-only
+        }
+    }
+
+    function applyStats(stats) {
+        document.querySelectorAll('[data-stat]').forEach(node => {
+            const value = stats[node.dataset.stat];
+            if (value !== undefined) node.textContent = value;
+        });
+    }
+
+    function sync() {
+        if (syncing) return syncing;
+        const store = readStore();
+        const params = store && store.cursor ? `?${new URLSearchParams({since: store.cursor})}` : '';
+        syncing = fetch(`/attendance/api/sync${params}`, {credentials: 'same-origin'})
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                const days = data.reset || !store ? {} : store.days;
+                data.days.forEach(day => { days[day.formatted_date] = day; });
+                writeStore({cursor: data.cursor, fiscal_start: data.fiscal_start, today: data.today, days, stats: data.stats});
+
+                applyStats(data.stats);
+                const changed = data.days.map(day => day.formatted_date);
+                if (changed.length && window.agbRefreshCalendarDays) {
+                    return window.agbRefreshCalendarDays(changed);
+                }
+            })
+            .finally(() => { syncing = null; });
+        return syncing;
+    }
+
+    // Month payload shaped like /attendance/api/calendar, if the store holds every day of it
+    function storedMonth(year, month) {
+        const store = readStore();
+        if (!store) return null;
+        const numDays = new Date(year, month, 0).getDate();
+        const days = [];
+        for (let day = 1; day <= numDays; day++) {
+            const key = `${year}-${String(month).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
+            if (!store.days[key]) return null;
+            days.push(store.days[key]);
+        }
+        return {
+            year,
+            month,
+            month_name: new Date(year, month - 1, 1).toLocaleString('en', {month: 'long'}),
+            prev_month: month === 1 ? {year: year - 1, month: 12} : {year, month: month - 1},
+            next_month: month === 12 ? {year: year + 1, month: 1} : {year, month: month + 1},
+            today: store.today,
+            fiscal_start: store.fiscal_start,
+            days,
+        };
+    }
+
+    window.agbSync = sync;
+    window.agbStoredMonth = storedMonth;
+
+    document.addEventListener('DOMContentLoaded', function() {
+        if (!getEmployeeId() || (!document.querySelector('[data-stat]') && !document.getElementById('agb-calendar'))) return;
+
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('/attendance/sw.js', {scope: '/attendance/'}).catch(() => {});
+        }
+        const store = readStore();
+        if (store && !navigator.onLine) {
+            // Page served from the offline copy: show the last synced numbers
+            applyStats(store.stats);
+        }
+        sync().catch(() => {});
+        window.addEventListener('online', () => sync().catch(() => {}));
+    });
 })();
 
+// Live updates: the server pushes the dates touched by each attendance change
+// over the bus websocket, and only those are refetched
+(function() {
+    const DAY_UPDATE = 'attendance_dashboard/day_update';
+    const MAX_RETRY_DELAY = 60000;
+    let lastNotificationId = 0;
+    let retryDelay = 1000;
+
+    function refreshCalendar(dates) {
+        return window.agbRefreshCalendarDays ? window.agbRefreshCalendarDays(dates) : Promise.resolve();
+    }
 
+    function currentMonthDates() {
+        const container = document.getElementById('agb-calendar');
+        return container ? [`${container.dataset.year}-${container.dataset.month}-01`] : [];
+    }
 
-// Export functions for use in other scripts
-window.showDayDetails = showDayDetails;
-window.closeDayDetails = closeDayDetails;
-window.showLeaveNotification = showLeaveNotification;
-window.showNotification = showNotification;
\ No newline at end of file
+    function handleNotification(notification) {
+        lastNotificationId = Math.max(lastNotificationId, notification.id);
+        const message = notification.message || {};
+        if (message.type !== DAY_UPDATE) return;
+        // The delta sync refreshes the counters and the changed calendar days
+        window.agbSync().catch(() => {});
+    }
+
+    function connect() {
+        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const socket = new WebSocket(`${protocol}://${window.location.host}/websocket`);
+
+        socket.addEventListener('open', function() {
+            retryDelay = 1000;
+            // The server adds the logged-in employee's channel to the subscription
+            socket.send(JSON.stringify({
+                event_name: 'subscribe',
+                data: {channels: [], last: lastNotificationId},
+            }));
+        });
+        socket.addEventListener('message', function(event) {
+            let notifications;
+            try {
+                notifications = JSON.parse(event.data);
+            } catch (e) {
+                return;
+            }
+            if (Array.isArray(notifications)) {
+                notifications.forEach(handleNotification);
+            }
+        });
+        socket.addEventListener('close', function() {
+            setTimeout(connect, retryDelay);
+            retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        if (!document.querySelector('[data-stat]') && !document.getElementById('agb-calendar')) return;
+
+        // Used by pull-to-refresh instead of reloading the page
+        window.agbSoftRefresh = function() {
+            return Promise.all([window.agbSync(), refreshCalendar(currentMonthDates())]);
+        };
+        if ('WebSocket' in window) {
+            connect();
+        }
+    });
+})();
+
+
+// Absent and late lists: older pages are appended as the list end scrolls into view
+(function() {
+    const PAGE_SIZE = 30;
+    const ENDPOINTS = {absent: '/attendance/api/absent', late: '/attendance/api/late'};
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function icon(name) {
+        return el('i', `fa ${name}`);
+    }
+
+    function renderDate(record) {
+        const wrapper = el('div', 'agb-detail-date');
+        const text = el('div');
+        text.append(el('h3', null, record.formatted_date), el('p', null, record.iso_date));
+        wrapper.append(icon('fa-calendar'), text);
+        return wrapper;
+    }
+
+    function renderTime(label, value) {
+        const item = el('div', 'agb-time-item');
+        const valueNode = el('span', 'agb-time-value');
+        if (value) {
+            valueNode.appendChild(el('span', 'agb-time-display', value));
+        } else {
+            const missing = el('span', 'agb-absent-indicator');
+            missing.append(icon('fa-times-circle agb-text-red'), ' Not recorded');
+            valueNode.appendChild(missing);
+        }
+        item.append(icon('fa-clock-o'), ' ', el('span', 'agb-time-label', label), ' ', valueNode);
+        return item;
+    }
+
+    function renderAbsentCard(record) {
+        const card = el('div', 'agb-detail-card agb-absent-card');
+        const times = el('div', 'agb-detail-times');
+        times.append(renderTime('Check In:', record.check_in_time), renderTime('Check Out:', record.check_out_time));
+        const status = el('div', `agb-detail-status agb-status-absent agb-${record.status.replace('_', '-')}`,
+            record.absence_type.toUpperCase());
+        card.append(renderDate(record), times, status);
+        return card;
+    }
+
+    function renderLateCard(record) {
+        const card = el('div', 'agb-detail-card agb-late-card');
+        const times = el('div', 'agb-detail-times');
+        const checkIn = el('div', 'agb-time-item');
+        checkIn.append(icon('fa-clock-o'), ' ', el('span', 'agb-time-label', 'Check In:'), ' ',
+            el('span', 'agb-time-value', record.check_in_time));
+        const late = el('div', 'agb-late-indicator');
+        late.append(icon('fa-exclamation-triangle'), ' ', el('span', 'agb-late-minutes', `${record.late_minutes} min late`));
+        times.append(checkIn, late);
+        const status = el('div', `agb-detail-status agb-status-late agb-severity-${record.severity}`, 'LATE');
+        card.append(renderDate(record), times, status);
+        return card;
+    }
+
+    function setupList(list) {
+        const kind = list.dataset.listKind;
+        const loadMore = list.parentElement.querySelector('.agb-load-more');
+        if (!loadMore || !('IntersectionObserver' in window)) {
+            return;  // Last page already shown, or no observer: keep the "Load older" link
+        }
+        const render = kind === 'absent' ? renderAbsentCard : renderLateCard;
+        const entriesKey = kind === 'absent' ? 'absent_days' : 'late_days';
+        let loading = false;
+
+        function loadNextPage() {
+            const cursor = list.dataset.nextCursor;
+            if (loading || !cursor) return;
+            loading = true;
+            loadMore.classList.add('agb-loading');
+
+            const params = new URLSearchParams({before: cursor, limit: PAGE_SIZE});
+            fetch(`${ENDPOINTS[kind]}?${params}`, {credentials: 'same-origin'})
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                    return response.json();
+                })
+                .then(data => {
+                    const fragment = document.createDocumentFragment();
+                    data[entriesKey].forEach(record => fragment.appendChild(render(record)));
+                    list.appendChild(fragment);
+                    if (data.next_cursor) {
+                        list.dataset.nextCursor = data.next_cursor;
+                        loadMore.querySelector('a').href = `${window.location.pathname}?${new URLSearchParams({before: data.next_cursor})}`;
+                    } else {
+                        delete list.dataset.nextCursor;
+                        observer.disconnect();
+                        loadMore.remove();
+                    }
+                })
+                .catch(() => {
+                    // Stop loading on scroll; a click on the link retries
+                    observer.disconnect();
+                })
+                .finally(() => {
+                    loading = false;
+                    loadMore.classList.remove('agb-loading');
+                });
+        }
+
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextPage();
+            }
+        }, {rootMargin: '400px 0px'});
+        observer.observe(loadMore);
+        loadMore.querySelector('a').addEventListener('click', function(event) {
+            event.preventDefault();
+            loadNextPage();
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('.agb-details-list[data-list-kind]').forEach(setupList);
+    });
+})();
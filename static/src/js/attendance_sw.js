@@ -0,0 +1,72 @@
+// Service worker of the attendance portal, served as /attendance/sw.js.
+// Pages are fetched network first and kept as offline copies; asset bundles
+// (whose URLs change with their content) and static files are served from the
+// cache. JSON API calls are left to the page, which keeps its own synced store.
+const CACHE_NAME = 'agb-attendance-v2';
+const PRECACHE = [
+    '/attendance/dashboard',
+    '/attendance/calendar',
+];
+// Pages that must always come from the server
+const NEVER_CACHED = ['/attendance/logout', '/attendance/api/', '/attendance/export', '/attendance/sw.js'];
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => Promise.all(PRECACHE.map(url => cache.add(url).catch(() => {}))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE_NAME).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function isCacheable(response) {
+    // Redirects go to the login page: never keep them as the offline copy
+    return response.ok && !response.redirected && response.type === 'basic';
+}
+
+function networkFirst(request) {
+    return fetch(request).then(response => {
+        if (isCacheable(response)) {
+            const copy = response.clone();
+            caches.open(CACHE_NAME).then(cache => cache.put(request, copy));
+        }
+        return response;
+    }).catch(() => caches.match(request)
+        // Offline: any copy of the page, e.g. the calendar of another month
+        .then(cached => cached || caches.match(new URL(request.url).pathname))
+        .then(cached => cached || Response.error()));
+}
+
+function staleWhileRevalidate(request) {
+    return caches.open(CACHE_NAME).then(cache => cache.match(request).then(cached => {
+        const refresh = fetch(request).then(response => {
+            if (isCacheable(response)) {
+                cache.put(request, response.clone());
+            }
+            return response;
+        }).catch(() => cached || Response.error());
+        return cached || refresh;
+    }));
+}
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+    if (NEVER_CACHED.some(prefix => url.pathname.startsWith(prefix))) return;
+
+    if (url.pathname.startsWith('/web/assets/') || url.pathname.startsWith('/attendance_dashboard/static/')) {
+        event.respondWith(staleWhileRevalidate(request));
+    } else if (url.pathname.startsWith('/attendance/') && request.mode === 'navigate') {
+        event.respondWith(networkFirst(request));
+    }
+});
@@ -0,0 +1,64 @@
+// Day details modal of the calendar, loaded lazily by attendance_dashboard.js
+function showDayDetails(element) {
+    const modal = document.getElementById('day-details-modal');
+    const dateElement = document.getElementById('modal-date');
+    const shiftElement = document.getElementById('modal-shift');
+    const checkinElement = document.getElementById('modal-checkin');
+    const checkoutElement = document.getElementById('modal-checkout');
+    const lateElement = document.getElementById('modal-late');
+    const statusElement = document.getElementById('modal-status');
+    const attendanceElement = document.getElementById('modal-attendance');
+
+    const date = element.getAttribute('data-date');
+    const checkin = element.getAttribute('data-checkin');
+    const checkout = element.getAttribute('data-checkout');
+    const late = element.getAttribute('data-late');
+    const shift = element.getAttribute('data-shift');
+    let status = element.getAttribute('data-status');
+    const attendanceFraction = parseFloat(element.getAttribute('data-attendance-fraction') || '1');
+
+    // Handle partial attendance
+    if (attendanceFraction === 0.5) {
+        status = 'partial';
+    }
+
+    if (dateElement) dateElement.textContent = date;
+    if (shiftElement) shiftElement.textContent = shift;
+    if (checkinElement) checkinElement.textContent = checkin || 'Not recorded';
+    if (checkoutElement) checkoutElement.textContent = checkout || 'Not recorded';
+    if (lateElement) lateElement.textContent = late + ' minutes';
+    if (attendanceElement) attendanceElement.textContent = attendanceFraction.toFixed(1);
+
+    if (statusElement) {
+        statusElement.textContent = status.charAt(0).toUpperCase() + status.slice(1);
+        statusElement.className = 'agb-status-badge agb-status-' + status;
+    }
+
+    if (modal) modal.classList.add('show');
+}
+
+// Close day details modal
+function closeDayDetails() {
+    const modal = document.getElementById('day-details-modal');
+    if (modal) {
+        modal.classList.remove('show');
+    }
+}
+
+// Close modal when clicking outside
+document.addEventListener('click', function(event) {
+    const modal = document.getElementById('day-details-modal');
+    if (modal && event.target === modal) {
+        closeDayDetails();
+    }
+});
+
+// Close modal with Escape key
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'Escape') {
+        closeDayDetails();
+    }
+});
+
+window.showDayDetails = showDayDetails;
+window.closeDayDetails = closeDayDetails;
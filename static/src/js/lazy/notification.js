@@ -0,0 +1,42 @@
+// Toast notifications, loaded lazily by attendance_dashboard.js
+function showLeaveNotification() {
+    showNotification('Leave management feature coming soon!', 'info');
+}
+
+// Generic notification function
+function showNotification(message, type = 'info') {
+    const container = document.getElementById('notification-container') || createNotificationContainer();
+    
+    const notification = document.createElement('div');
+    notification.className = `agb-notification ${type}`;
+    notification.textContent = message;
+    
+    container.appendChild(notification);
+    
+    // Trigger animation
+    setTimeout(() => {
+        notification.classList.add('show');
+    }, 100);
+    
+    // Auto remove after 3 seconds
+    setTimeout(() => {
+        notification.classList.remove('show');
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 300);
+    }, 3000);
+}
+
+// Create notification container if it doesn't exist
+function createNotificationContainer() {
+    const container = document.createElement('div');
+    container.id = 'notification-container';
+    container.className = 'agb-notification-container';
+    document.body.appendChild(container);
+    return container;
+}
+
+window.showLeaveNotification = showLeaveNotification;
+window.showNotification = showNotification;
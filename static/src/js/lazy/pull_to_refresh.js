@@ -0,0 +1,69 @@
+// Pull-to-refresh on touch devices, loaded lazily by attendance_dashboard.js
+(function() {
+    let startY = 0;
+    let currentY = 0;
+    let isPulling = false;
+    const threshold = 60; // pixels to trigger refresh
+
+    // Create refresh icon
+    let refreshIcon = document.getElementById('pull-refresh-icon');
+    if (!refreshIcon) {
+        refreshIcon = document.createElement('div');
+        refreshIcon.id = 'pull-refresh-icon';
+        refreshIcon.innerHTML = '<i class="fa fa-spinner fa-spin"></i>';
+        document.body.appendChild(refreshIcon);
+    }
+
+    function touchStartHandler(e) {
+        if (window.scrollY === 0) { // only at top
+            startY = e.touches[0].clientY;
+            isPulling = true;
+            refreshIcon.style.top = '20px';
+            refreshIcon.style.opacity = '0';
+        }
+    }
+
+    function touchMoveHandler(e) {
+        if (!isPulling) return;
+        currentY = e.touches[0].clientY;
+        let deltaY = currentY - startY;
+
+        if (deltaY > 0) { // pulling down
+            refreshIcon.style.display = 'block';
+            refreshIcon.style.top = `${20 + deltaY / 2}px`;
+            refreshIcon.style.opacity = Math.min(deltaY / threshold, 1);
+
+            if (deltaY > threshold) {
+                refreshIcon.classList.add('ready'); // optional styling
+            } else {
+                refreshIcon.classList.remove('ready');
+            }
+        }
+    }
+
+    function touchEndHandler() {
+        if (!isPulling) return;
+        let deltaY = currentY - startY;
+        if (deltaY > threshold) {
+            refreshIcon.innerHTML = '<i class="fa fa-spinner fa-spin"></i>';
+            if (window.agbSoftRefresh) {
+                // Refetch the counters and calendar in place; reload only if that fails
+                window.agbSoftRefresh()
+                    .then(() => { refreshIcon.style.display = 'none'; })
+                    .catch(() => window.location.reload());
+            } else {
+                setTimeout(() => {
+                    window.location.reload();
+                }, 200);
+            }
+        } else {
+            // Hide icon
+            refreshIcon.style.display = 'none';
+        }
+        isPulling = false;
+    }
+
+    document.addEventListener('touchstart', touchStartHandler, {passive: true});
+    document.addEventListener('touchmove', touchMoveHandler, {passive: true});
+    document.addEventListener('touchend', touchEndHandler);
+})();
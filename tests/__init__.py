@@ -0,0 +1,6 @@
+from . import test_attendance_api
+from . import test_attendance_day_summary
+from . import test_attendance_export
+from . import test_dashboard_benchmark
+from . import test_employee_login_provision
+from . import test_login_throttle
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, time
+import random
+import pytz
+
+MYANMAR_TZ = pytz.timezone('Asia/Yangon')
+
+
+def generate_attendance_vals(employee_ids, first_day, last_day, seed=42):
+    """
+    Build a reproducible synthetic ``hr.attendance`` history.
+
+    Returns ``(vals_list, open_indexes)``: create values for every employee and
+    working day between ``first_day`` and ``last_day``, and the positions of the
+    records whose check-out must be cleared afterwards to simulate a forgotten
+    check-out (hr.attendance refuses to create several open attendances).
+
+    Each working day is, with fixed odds: a full day (a share of them late),
+    a half day under 5 hours, a forgotten check-out or an absence.
+    """
+    rng = random.Random(seed)
+    vals_list = []
+    open_indexes = []
+    for employee_id in employee_ids:
+        day = first_day
+        while day <= last_day:
+            if day.weekday() < 5:
+                roll = rng.random()
+                if roll < 0.08:
+                    day += timedelta(days=1)
+                    continue  # absent
+
+                late = rng.random() < 0.2
+                start_minute = 9 * 60 + (rng.randint(1, 45) if late else -rng.randint(0, 20))
+                check_in = MYANMAR_TZ.localize(datetime.combine(day, time())) + timedelta(minutes=start_minute)
+                if roll < 0.15:
+                    worked = timedelta(hours=rng.uniform(2, 4.9))  # half day
+                else:
+                    worked = timedelta(hours=rng.uniform(8, 9.5))
+
+                if roll >= 0.15 and roll < 0.20:
+                    open_indexes.append(len(vals_list))  # forgotten check-out
+                vals_list.append({
+                    'employee_id': employee_id,
+                    'check_in': check_in.astimezone(pytz.utc).replace(tzinfo=None),
+                    'check_out': (check_in + worked).astimezone(pytz.utc).replace(tzinfo=None),
+                })
+            day += timedelta(days=1)
+    return vals_list, open_indexes
@@ -0,0 +1,176 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import HttpCase, tagged
+
+from odoo.addons.attendance_dashboard.models.attendance_day_summary import fiscal_period_start, to_local_date
+from .common import generate_attendance_vals
+
+
+@tagged('post_install', '-at_install')
+class TestAttendanceApi(HttpCase):
+    """The JSON API of the mobile app, authenticated with the X-Employee-Token header."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employee = cls.env['hr.employee'].create({'name': 'Api Employee', 'employee_number': 'API0001'})
+        cls.login = cls.env['employee.login'].create({'employee_number': cls.employee.id, 'password': 'api'})
+
+    def _get(self, path, token=None, **headers):
+        headers['X-Employee-Token'] = token or self.login.login_token
+        return self.url_open(path, headers=headers)
+
+    def test_unauthorized(self):
+        response = self.url_open('/attendance/api/stats')
+        self.assertEqual(response.status_code, 401)
+
+    def test_etag(self):
+        response = self._get('/attendance/api/stats')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(response.json()['employee']['id'], self.employee.id)
+
+        # Stable while nothing changes, and a matching If-None-Match gets an empty 304
+        self.assertEqual(self._get('/attendance/api/stats').headers['ETag'], etag)
+        response = self._get('/attendance/api/stats', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertFalse(response.content)
+
+        # A new attendance changes the summaries, hence the ETag
+        now = fields.Datetime.now()
+        self.env['hr.attendance'].create({
+            'employee_id': self.employee.id,
+            'check_in': now - timedelta(hours=1),
+            'check_out': now,
+        })
+        response = self._get('/attendance/api/stats', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_etag_per_endpoint(self):
+        stats = self._get('/attendance/api/stats').headers['ETag']
+        absent = self._get('/attendance/api/absent').headers['ETag']
+        self.assertNotEqual(stats, absent)
+        response = self._get('/attendance/api/absent', **{'If-None-Match': stats})
+        self.assertEqual(response.status_code, 200)
+
+    def test_calendar_bad_request(self):
+        self.assertEqual(self._get('/attendance/api/calendar?year=2024&month=2').status_code, 200)
+        for query in ('year=abc', 'month=13', 'month=0', 'year=2024&month=x', 'year=0&month=1'):
+            response = self._get(f'/attendance/api/calendar?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.json(), {'error': 'bad_request'})
+
+    def test_token_expiry(self):
+        self.assertEqual(self._get('/attendance/api/stats').status_code, 200)
+        self.url_open('/attendance/logout')
+
+        self.login.token_expiry = fields.Datetime.now() - timedelta(minutes=1)
+        self.assertEqual(self._get('/attendance/api/stats').status_code, 401)
+
+        # Tokens issued before expiry existed are not accepted either
+        self.login.token_expiry = False
+        self.assertEqual(self._get('/attendance/api/stats').status_code, 401)
+
+    def test_revoked_token_ends_session(self):
+        token = self.login.login_token
+        self.assertEqual(self._get('/attendance/api/stats', token).status_code, 200)
+        # The session opened by the token works without the header...
+        self.assertEqual(self.url_open('/attendance/api/stats').status_code, 200)
+
+        # ...until the token is revoked
+        self.login.action_revoke_token()
+        self.assertEqual(self.url_open('/attendance/api/stats').status_code, 401)
+        self.assertEqual(self._get('/attendance/api/stats', token).status_code, 401)
+
+
+@tagged('post_install', '-at_install')
+class TestTeamApi(HttpCase):
+    """Team totals come from one grouped aggregate and must agree with the members' own stats."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Employee = cls.env['hr.employee']
+        cls.department = cls.env['hr.department'].create({'name': 'Api Department'})
+        cls.manager = Employee.create({'name': 'Api Manager', 'employee_number': 'APIM001'})
+        cls.members = Employee.create([
+            {'name': f'Api Member {i}', 'employee_number': f'APIM10{i}', 'parent_id': cls.manager.id,
+             'department_id': cls.department.id}
+            for i in range(3)
+        ])
+        cls.department_manager = Employee.create({'name': 'Api Department Manager', 'employee_number': 'APIM002'})
+        cls.department.manager_id = cls.department_manager
+
+        today = to_local_date(fields.Datetime.now())
+        vals_list, _open = generate_attendance_vals(cls.members.ids, fiscal_period_start(today), today)
+        cls.env['hr.attendance'].create([vals for vals in vals_list if vals['check_out'] < fields.Datetime.now()])
+        cls.logins = cls.env['employee.login'].create([
+            {'employee_number': employee.id, 'password': 'api'}
+            for employee in cls.manager | cls.department_manager | cls.members
+        ])
+
+    def _get(self, path, employee):
+        token = self.logins.filtered(lambda login: login.employee_number == employee).login_token
+        return self.url_open(path, headers={'X-Employee-Token': token})
+
+    def test_team_totals_match_member_stats(self):
+        response = self._get('/attendance/api/team', self.manager)
+        self.assertEqual(response.status_code, 200)
+        team = response.json()
+        self.assertEqual(team['totals']['members'], len(self.members))
+
+        for member in team['members']:
+            employee = self.members.browse(member['id'])
+            self.url_open('/attendance/logout')
+            stats = self._get('/attendance/api/stats', employee).json()['stats']
+            for key in ('attendanceCount', 'absentCount', 'lateCount'):
+                self.assertEqual(member[key], stats[key], f"{key} of {employee.name}")
+
+    def test_department_manager(self):
+        # No direct reports: the team is the managed department
+        response = self._get('/attendance/api/team', self.department_manager)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['team'], self.department.name)
+
+    def test_invalid_department(self):
+        for department_id in ('abc', str(self.department.id)):
+            self.url_open('/attendance/logout')
+            response = self._get(f'/attendance/api/team?department_id={department_id}', self.manager)
+            self.assertEqual(response.status_code, 403)
+
+
+@tagged('post_install', '-at_install')
+class TestProfiling(HttpCase):
+    """Sampled requests get a Server-Timing header, whatever the route returns."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employee = cls.env['hr.employee'].create({'name': 'Profiled Employee', 'employee_number': 'PROF001'})
+        cls.login = cls.env['employee.login'].create({'employee_number': cls.employee.id, 'password': 'api'})
+
+    def _get(self, path):
+        return self.url_open(path, headers={'X-Employee-Token': self.login.login_token})
+
+    def _set_rate(self, rate):
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.profiling_sample_rate', rate)
+
+    def test_sampled_response(self):
+        self._set_rate('1')
+        response = self._get('/attendance/api/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('total;dur=', response.headers['Server-Timing'])
+
+    def test_sampled_not_found(self):
+        # No reports and no department: the team page is a 404, not a 500
+        self._set_rate('1')
+        self.assertEqual(self._get('/attendance/team').status_code, 404)
+
+    def test_malformed_rate(self):
+        self._set_rate('often')
+        response = self._get('/attendance/api/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response.headers)
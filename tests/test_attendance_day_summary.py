@@ -0,0 +1,170 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytz
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.attendance_dashboard.models.attendance_day_summary import fiscal_period_start, to_local_date
+
+MYANMAR_TZ = pytz.timezone('Asia/Yangon')
+
+
+def utc(year, month, day, hour, minute=0):
+    """Naive UTC datetime of a Myanmar-local wall-clock time."""
+    return MYANMAR_TZ.localize(datetime(year, month, day, hour, minute)).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+@tagged('post_install', '-at_install')
+class TestAttendanceDaySummary(TransactionCase):
+    """The summary rows follow every create, write and unlink of hr.attendance."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employee = cls.env['hr.employee'].create({'name': 'Summary Employee', 'employee_number': 'SUM0001'})
+        # Monday and Tuesday, working days of the default schedule
+        cls.monday, cls.tuesday = date(2024, 1, 8), date(2024, 1, 9)
+
+    def _summary(self, day):
+        return self.env['attendance.day.summary'].search([
+            ('employee_id', '=', self.employee.id), ('date', '=', day),
+        ])
+
+    def _attend(self, check_in, check_out=False):
+        return self.env['hr.attendance'].create({
+            'employee_id': self.employee.id,
+            'check_in': check_in,
+            'check_out': check_out,
+        })
+
+    def test_create(self):
+        att = self._attend(utc(2024, 1, 8, 8, 45), utc(2024, 1, 8, 17, 30))
+        row = self._summary(self.monday)
+        self.assertEqual(row.attendance_id, att)
+        self.assertEqual(row.status, 'present')
+        self.assertEqual(row.attendance_fraction, 1.0)
+        self.assertEqual(row.absent_fraction, 0.0)
+        self.assertFalse(row.is_weekend)
+
+    def test_early_morning_check_in(self):
+        # 06:00 in Yangon is still the previous day in UTC
+        check_in = utc(2024, 1, 9, 6, 0)
+        self.assertEqual(check_in.date(), self.monday)
+        att = self._attend(check_in, utc(2024, 1, 9, 15, 0))
+
+        self.assertEqual(att.check_in_local_date, self.tuesday)
+        self.assertEqual(self._summary(self.tuesday).attendance_id, att)
+        self.assertFalse(self._summary(self.monday))
+
+    def test_open_check_in(self):
+        self._attend(utc(2024, 1, 8, 9, 0))
+        row = self._summary(self.monday)
+        self.assertEqual(row.status, 'partial')
+        self.assertEqual(row.absence_type, 'Evening Absent')
+        self.assertEqual(row.absent_fraction, 0.5)
+
+    def test_write(self):
+        att = self._attend(utc(2024, 1, 8, 8, 45), utc(2024, 1, 8, 17, 30))
+        att.write({'check_out': utc(2024, 1, 8, 11, 0)})
+        row = self._summary(self.monday)
+        self.assertEqual(row.status, 'partial')
+        self.assertEqual(row.attendance_fraction, 0.5)
+        self.assertAlmostEqual(row.working_hours, 2.25)
+
+        # Moving the attendance to another day reclassifies both days
+        att.write({'check_in': utc(2024, 1, 9, 8, 45), 'check_out': utc(2024, 1, 9, 17, 30)})
+        self.assertEqual(self._summary(self.tuesday).status, 'present')
+        monday = self._summary(self.monday)
+        self.assertFalse(monday.attendance_id)
+        self.assertEqual(monday.status, 'absent')
+        self.assertEqual(monday.absent_fraction, 1.0)
+
+    def test_unlink(self):
+        att = self._attend(utc(2024, 1, 8, 8, 45), utc(2024, 1, 8, 17, 30))
+        att.unlink()
+        row = self._summary(self.monday)
+        self.assertFalse(row.attendance_id)
+        self.assertEqual(row.status, 'absent')
+        self.assertEqual(row.absence_type, 'Full Day Absent')
+
+    def test_backfill(self):
+        att = self._attend(utc(2024, 1, 8, 8, 45), utc(2024, 1, 8, 17, 30))
+        self._summary(self.monday).unlink()
+        self.env['attendance.day.summary']._backfill(employee_ids=self.employee.ids)
+        self.assertEqual(self._summary(self.monday).attendance_id, att)
+
+    def test_public_holiday(self):
+        Summary = self.env['attendance.day.summary']
+        rollup = self.env['attendance.month.rollup'].create({
+            'employee_id': self.employee.id,
+            'period_start': date(2023, 8, 29),
+            'first_day': date(2024, 1, 1),
+            'last_day': date(2024, 1, 31),
+        })
+        stamp = Summary._get_employee_stamp(self.employee.id, self.monday, self.tuesday)
+
+        # A holiday on a day without attendance, hence without summary row
+        self.env['resource.calendar.leaves'].create({
+            'name': 'Public Holiday',
+            'calendar_id': self.employee.resource_calendar_id.id,
+            'date_from': utc(2024, 1, 8, 0, 0),
+            'date_to': utc(2024, 1, 9, 0, 0),
+        })
+        # The rules change right away, the reclassification just before commit
+        self.assertTrue(rollup.exists())
+        self.env.cr.precommit.run()
+        schedule = Summary._get_schedule(self.employee)
+        self.assertTrue(schedule.day_rules(self.monday).is_holiday)
+        self.assertEqual(Summary._classify_day(self.monday, None, schedule)['status'], 'holiday')
+        self.assertFalse(rollup.exists())
+        self.assertNotEqual(Summary._get_employee_stamp(self.employee.id, self.monday, self.tuesday), stamp)
+
+    def test_calendar_lines_reclassify_once(self):
+        calendar = self.employee.resource_calendar_id
+        SummaryClass = type(self.env['attendance.day.summary'])
+        with patch.object(SummaryClass, '_reclassify', autospec=True, return_value=True) as reclassify:
+            # One write per line, then one on the calendar, as a form save does
+            for line in calendar.attendance_ids:
+                line.write({'hour_from': line.hour_from})
+            calendar.write({'attendance_ids': [(0, 0, {
+                'name': 'Saturday',
+                'dayofweek': '5',
+                'hour_from': 8,
+                'hour_to': 12,
+                'day_period': 'morning',
+            })]})
+            self.assertFalse(reclassify.called)
+            self.env.cr.precommit.run()
+        self.assertEqual(reclassify.call_count, 1)
+        self.assertIn(self.employee.id, reclassify.call_args.args[1])
+
+    def test_calendar_change(self):
+        today = to_local_date(fields.Datetime.now())
+        saturday = today - timedelta(days=(today.weekday() - 5) % 7 or 7)
+        if saturday < fiscal_period_start(today):
+            self.skipTest("No Saturday yet in the current fiscal period")
+
+        att = self._attend(utc(saturday.year, saturday.month, saturday.day, 9, 30),
+                           utc(saturday.year, saturday.month, saturday.day, 17, 0))
+        self.assertEqual(self._summary(saturday).status, 'weekend')
+
+        six_days = self.env['resource.calendar'].create({
+            'name': 'Six Days',
+            'attendance_ids': [(0, 0, {
+                'name': f'Day {weekday}',
+                'dayofweek': str(weekday),
+                'hour_from': 8,
+                'hour_to': 17,
+                'day_period': 'morning',
+            }) for weekday in range(6)],
+        })
+        self.employee.resource_calendar_id = six_days
+
+        row = self._summary(saturday)
+        self.assertFalse(row.is_weekend)
+        self.assertEqual(row.status, 'present')
+        if 'display_late_minutes' not in att._fields:
+            self.assertEqual(att.late_minutes, 90)
+            self.assertEqual(row.late_minutes, 90)
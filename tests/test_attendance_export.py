@@ -0,0 +1,40 @@
+import io
+import re
+import zipfile
+from datetime import date
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.attendance_dashboard.controllers import export
+from odoo.addons.attendance_dashboard.models.attendance_export import EXPORT_HEADER
+
+
+@tagged('post_install', '-at_install')
+class TestAttendanceExport(TransactionCase):
+    """The XLSX export continues on a new worksheet when one is full."""
+
+    def _xlsx(self, rows):
+        controller = export.AttendanceExportController()
+        with patch.object(export.AttendanceExportController, '_iter_rows', return_value=iter(rows)):
+            body = b''.join(controller._stream_xlsx(None, None, None, [], date.today(), date.today()))
+        return zipfile.ZipFile(io.BytesIO(body))
+
+    def _row_count(self, workbook, sheet_number):
+        return len(re.findall(rb'<row ', workbook.read(f'xl/worksheets/sheet{sheet_number}.xml')))
+
+    def test_sheet_rollover(self):
+        rows = [['EMP%04d' % index] + [''] * (len(EXPORT_HEADER) - 1) for index in range(5)]
+        # Header plus two rows per sheet
+        with patch.object(export, 'XLSX_MAX_ROWS', 3):
+            workbook = self._xlsx(rows)
+
+        sheet_names = re.findall(rb'<sheet name="([^"]+)"', workbook.read('xl/workbook.xml'))
+        self.assertEqual(sheet_names, [b'Attendance', b'Attendance 2', b'Attendance 3'])
+        self.assertEqual([self._row_count(workbook, number) for number in (1, 2, 3)], [3, 3, 2])
+
+    def test_empty_export(self):
+        workbook = self._xlsx([])
+        sheet_names = re.findall(rb'<sheet name="([^"]+)"', workbook.read('xl/workbook.xml'))
+        self.assertEqual(sheet_names, [b'Attendance'])
+        self.assertEqual(self._row_count(workbook, 1), 1)
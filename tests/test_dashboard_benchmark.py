@@ -0,0 +1,175 @@
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from dateutil.relativedelta import relativedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.attendance_dashboard.controllers import dashboard
+from odoo.addons.attendance_dashboard.models.stats_cache import stats_cache
+from .common import generate_attendance_vals
+
+_logger = logging.getLogger(__name__)
+
+# Dataset size, overridable for local runs on a bigger dataset
+BENCH_EMPLOYEES = int(os.environ.get('ATTENDANCE_BENCH_EMPLOYEES', 5))
+BENCH_YEARS = int(os.environ.get('ATTENDANCE_BENCH_YEARS', 1))
+
+# Maximum SQL queries per call; the helpers must stay constant in the period length
+QUERY_THRESHOLDS = {
+    'calculate_stats': 9,
+    'calculate_stats_cached': 4,
+    'calculate_stats_rollup': 6,
+    'calendar_month': 8,
+    'absent_days': 8,
+    'late_days': 8,
+    'absent_page': 10,
+    'late_page': 6,
+    'check_password': 4,
+}
+
+
+@tagged('post_install', '-at_install', 'attendance_benchmark')
+class TestDashboardBenchmark(TransactionCase):
+    """
+    Times the dashboard helpers against a synthetic attendance history and
+    fails when their SQL query counts regress.
+
+    Run with ``--test-tags attendance_benchmark``; scale the dataset with the
+    ATTENDANCE_BENCH_EMPLOYEES and ATTENDANCE_BENCH_YEARS environment variables.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.controller = dashboard.AttendanceDashboardController()
+        cls.start_date, cls.end_date = cls.controller._get_fiscal_period()
+        first_day = (cls.start_date - relativedelta(years=BENCH_YEARS - 1)).date()
+
+        cls.employees = cls.env['hr.employee'].create([
+            {'name': f'Benchmark Employee {i}', 'employee_number': f'BENCH{i:04d}'}
+            for i in range(BENCH_EMPLOYEES)
+        ])
+        vals_list, open_indexes = generate_attendance_vals(cls.employees.ids, first_day, cls.end_date.date())
+        attendances = cls.env['hr.attendance'].create(vals_list)
+
+        # Forgotten check-outs are cleared behind the ORM's back, then resynced
+        forgotten = attendances.browse([attendances.ids[i] for i in open_indexes])
+        if forgotten:
+            cls.env.cr.execute("""
+                UPDATE hr_attendance SET check_out = NULL, check_out_local_date = NULL WHERE id IN %s
+            """, [tuple(forgotten.ids)])
+            forgotten.invalidate_recordset()
+            cls.env['attendance.day.summary']._refresh_days(forgotten._get_summary_keys())
+
+        cls.employee = cls.employees[0]
+        cls.login = cls.env['employee.login'].create({
+            'employee_number': cls.employee.id,
+            'password': 'benchmark',
+        })
+        _logger.info("Benchmark dataset: %s employees, %s attendances", len(cls.employees), len(attendances))
+
+    def setUp(self):
+        super().setUp()
+        fake_request = SimpleNamespace(
+            env=self.env,
+            session={'employee_number': self.employee.id},
+            httprequest=SimpleNamespace(headers={}),
+        )
+        patcher = patch.object(dashboard, 'request', fake_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        stats_cache.clear()
+
+    @contextmanager
+    def _measure(self, name):
+        """Report wall time, SQL queries and peak memory of the block, and check the query threshold."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        cr = self.env.cr
+        queries_before = cr.sql_log_count
+        tracemalloc.start()
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queries = cr.sql_log_count - queries_before
+
+        _logger.info(
+            "benchmark %-24s wall=%8.2fms queries=%4d peak_mem=%8.1fKiB",
+            name, elapsed * 1000, queries, peak / 1024,
+        )
+        self.assertLessEqual(
+            queries, QUERY_THRESHOLDS[name],
+            f"{name} ran {queries} queries (threshold {QUERY_THRESHOLDS[name]})",
+        )
+
+    def test_calculate_stats(self):
+        with self._measure('calculate_stats'):
+            stats = self.controller._calculate_stats(self.employee, self.start_date, self.end_date)
+        self.assertEqual(stats['total_days'], (self.end_date.date() - self.start_date.date()).days + 1)
+
+        with self._measure('calculate_stats_cached'):
+            cached = self.controller._calculate_stats(self.employee, self.start_date, self.end_date)
+        self.assertEqual(stats, cached)
+
+    def test_calculate_stats_rollup(self):
+        live = self.controller._calculate_stats(self.employee, self.start_date, self.end_date)
+        self.env['attendance.month.rollup']._cron_rebuild_rollups()
+        stats_cache.clear()
+
+        with self._measure('calculate_stats_rollup'):
+            stats = self.controller._calculate_stats(self.employee, self.start_date, self.end_date)
+        self.assertEqual(stats, live)
+
+    def test_calendar_month(self):
+        today = self.controller._now_myanmar()
+        with self._measure('calendar_month'):
+            calendar_data = self.controller._get_calendar_data(self.employee, today.year, today.month)
+        self.assertEqual(calendar_data[1]['date'].day, 1)
+
+    def test_absent_days(self):
+        with self._measure('absent_days'):
+            absent_days = self.controller._get_absent_days(self.employee)
+        self.assertTrue(all(day['absent_fraction'] in (0.5, 1.0) for day in absent_days))
+
+    def test_late_days(self):
+        with self._measure('late_days'):
+            late_days, total_late_minutes, _avg = self.controller._get_late_days(self.employee)
+        self.assertEqual(total_late_minutes, sum(day['late_minutes'] for day in late_days))
+
+    def test_absent_page(self):
+        with self._measure('absent_page'):
+            page = self.controller._get_absent_page(self.employee, limit=10)
+        dates = [day['date'] for day in page['entries']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+        if page['next_cursor']:
+            cursor = self.controller._parse_date_cursor(page['next_cursor'])
+            older = self.controller._get_absent_page(self.employee, cursor, limit=10)
+            self.assertTrue(all(day['date'] < dates[-1] for day in older['entries']))
+
+        totals = self.controller._get_period_totals(self.employee)
+        self.assertEqual(totals['absentDays'], len(self.controller._get_absent_days(self.employee)))
+
+    def test_late_page(self):
+        with self._measure('late_page'):
+            page = self.controller._get_late_page(self.employee, limit=10)
+        late_days, _total, _avg = self.controller._get_late_days(self.employee)
+        self.assertEqual(page['entries'], late_days[:10])
+
+        if page['next_cursor']:
+            cursor = self.controller._parse_datetime_cursor(page['next_cursor'])
+            older = self.controller._get_late_page(self.employee, cursor, limit=10)
+            self.assertEqual(older['entries'], late_days[10:20])
+
+    def test_login(self):
+        with self._measure('check_password'):
+            self.assertTrue(self.login.check_password('benchmark'))
+        self.assertFalse(self.login.check_password('wrong'))
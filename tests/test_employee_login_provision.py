@@ -0,0 +1,142 @@
+import base64
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from odoo.service import server as odoo_server
+from odoo.tests import HttpCase, TransactionCase, tagged
+
+from odoo.addons.attendance_dashboard.models import employee_login
+from odoo.addons.attendance_dashboard.models.employee_login import PARALLEL_HASH_MIN, pwd_context_for
+
+
+def activation_token(link):
+    return parse_qs(urlparse(link).query)['token'][0]
+
+
+@tagged('post_install', '-at_install')
+class TestEmployeeLoginProvision(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # More employees than PARALLEL_HASH_MIN; the tests run without prefork,
+        # so they hash in-process, except test_prefork_pool
+        cls.employees = cls.env['hr.employee'].create([
+            {'name': f'Provision Employee {i}', 'employee_number': f'PROV{i:04d}'}
+            for i in range(PARALLEL_HASH_MIN + 4)
+        ])
+        cls.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.hash_workers', 2)
+
+    def _provision(self, **vals):
+        wizard = self.env['employee.login.provision'].create(vals)
+        wizard.action_provision()
+        rows = list(csv.DictReader(io.StringIO(base64.b64decode(wizard.result_file).decode())))
+        return wizard, {row['Employee ID']: row for row in rows}
+
+    def _login(self, employee):
+        return self.env['employee.login'].search([('employee_number', '=', employee.id)])
+
+    def test_generated_passwords(self):
+        self.env['employee.login'].create({'employee_number': self.employees[0].id, 'password': 'existing'})
+        wizard, rows = self._provision(employee_ids=[(6, 0, self.employees.ids)])
+
+        self.assertEqual(wizard.created_count, len(self.employees) - 1)
+        self.assertEqual(wizard.skipped_count, 1)
+        self.assertNotIn('PROV0000', rows)
+        self.assertTrue(self._login(self.employees[0]).check_password('existing'))
+        for employee in self.employees[1:]:
+            password = rows[employee.employee_number]['Password']
+            self.assertTrue(password)
+            self.assertTrue(self._login(employee).check_password(password))
+
+    def test_csv_passwords(self):
+        content = 'employee_number,password\nPROV0001,secret1\nPROV0002,\n'
+        wizard, rows = self._provision(
+            csv_file=base64.b64encode(content.encode()), password='shared')
+        self.assertEqual(set(rows), {'PROV0001', 'PROV0002'})
+        self.assertTrue(self._login(self.employees[1]).check_password('secret1'))
+        self.assertTrue(self._login(self.employees[2]).check_password('shared'))
+        self.assertEqual(rows['PROV0002']['Password'], '')
+
+    def test_activation_links_ignore_csv_passwords(self):
+        content = 'employee_number,password\nPROV0003,secret3\nPROV0004,\n'
+        _wizard, rows = self._provision(csv_file=base64.b64encode(content.encode()), credential_type='activation')
+        Login = self.env['employee.login']
+        for employee in self.employees[3:5]:
+            row = rows[employee.employee_number]
+            self.assertEqual(row['Password'], '')
+            self.assertIn('/employee/activate?token=', row['Activation Link'])
+            self.assertEqual(Login._get_login_by_activation_token(activation_token(row['Activation Link'])),
+                             self._login(employee))
+        self.assertFalse(self._login(self.employees[3]).check_password('secret3'))
+
+    def test_activation_single_use(self):
+        _wizard, rows = self._provision(employee_ids=[(6, 0, self.employees[5].ids)], credential_type='activation')
+        token = activation_token(rows['PROV0005']['Activation Link'])
+        Login = self.env['employee.login']
+
+        login = Login._redeem_activation_token(token, 'chosen')
+        self.assertEqual(login, self._login(self.employees[5]))
+        self.assertTrue(login.check_password('chosen'))
+        self.assertFalse(login.activation_token)
+        # The link is spent
+        self.assertFalse(Login._redeem_activation_token(token, 'hijacked'))
+        self.assertTrue(login.check_password('chosen'))
+
+    def test_activation_expiry(self):
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.activation_lifetime_hours', -1)
+        _wizard, rows = self._provision(employee_ids=[(6, 0, self.employees[6].ids)], credential_type='activation')
+        token = activation_token(rows['PROV0006']['Activation Link'])
+        self.assertFalse(self.env['employee.login']._redeem_activation_token(token, 'chosen'))
+
+    def test_prefork_pool(self):
+        # Pretend to be a prefork worker, the only server that hashes in a forked pool
+        prefork_server = odoo_server.PreforkServer.__new__(odoo_server.PreforkServer)
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.pbkdf2_rounds', 1000)
+        raw_passwords = [f'password{i}' for i in range(PARALLEL_HASH_MIN + 4)]
+        with patch.object(odoo_server, 'server', prefork_server), \
+                patch.object(employee_login, 'ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+            hashed = self.env['employee.login']._hash_passwords(raw_passwords)
+        self.assertTrue(pool.called)
+        self.assertEqual(len(hashed), len(raw_passwords))
+        for raw_password, password_hash in zip(raw_passwords, hashed):
+            self.assertTrue(pwd_context_for(1000).verify(raw_password, password_hash))
+
+
+@tagged('post_install', '-at_install')
+class TestEmployeeActivation(HttpCase):
+    """An activation link sets the password and logs in, once."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        employee = cls.env['hr.employee'].create({'name': 'Activation Employee', 'employee_number': 'ACT0001'})
+        Login = cls.env['employee.login']
+        cls.login = Login._create_hashed([dict(
+            employee_number=employee.id, password=Login._hash_password('unusable'),
+            **Login._new_activation_vals())])
+        cls.token = cls.login.activation_token
+
+    def _activate(self, password):
+        return self.url_open('/employee/activate', data={
+            'token': self.token,
+            'new_password': password,
+        }, allow_redirects=False)
+
+    def test_activate(self):
+        response = self.url_open(f'/employee/activate?token={self.token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ACT0001', response.text)
+
+        self.assertIn(self._activate('chosen').status_code, (302, 303))
+        self.login.invalidate_recordset()
+        self.assertTrue(self.login.check_password('chosen'))
+        self.assertFalse(self.login.activation_token)
+
+        # A second use of the link changes nothing
+        self.assertIn('invalid or has expired', self._activate('hijacked').text)
+        self.login.invalidate_recordset()
+        self.assertTrue(self.login.check_password('chosen'))
@@ -0,0 +1,66 @@
+from odoo import fields
+from odoo.tests import HttpCase, tagged
+
+from odoo.addons.attendance_dashboard.controllers.login_throttle import ACCOUNT_FAILURE_LIMIT, RETRY_AFTER_BUSY
+
+
+@tagged('post_install', '-at_install')
+class TestLoginThrottle(HttpCase):
+    """Failed logins are limited per account and IP, and verifications by the busy slots."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employee = cls.env['hr.employee'].create({'name': 'Throttle Employee', 'employee_number': 'THR0001'})
+        cls.env['employee.login'].create({'employee_number': cls.employee.id, 'password': 'right'})
+
+    def _login(self, password):
+        return self.url_open('/employee/register', data={
+            'employee_number': 'THR0001',
+            'password': password,
+        }, allow_redirects=False)
+
+    def _failures(self):
+        return self.env['employee.login.failure'].search_count([('scope', '=', 'account'), ('key', '=', 'THR0001')])
+
+    def test_account_lockout(self):
+        max_failures = ACCOUNT_FAILURE_LIMIT[0]
+        for _attempt in range(max_failures):
+            self.assertEqual(self._login('wrong').status_code, 200)
+        # Counted in the database, so shared by all workers
+        self.assertEqual(self._failures(), max_failures)
+
+        # Even the right password is refused until the window has passed
+        response = self._login('right')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response.headers['Retry-After']), 0)
+
+    def test_success_resets_failures(self):
+        self._login('wrong')
+        response = self._login('right')
+        self.assertIn(response.status_code, (302, 303))
+        self.assertEqual(self._failures(), 0)
+
+    def _fail_from_office(self, count):
+        self.env['employee.login.failure'].create([
+            {'scope': 'ip', 'key': '127.0.0.1', 'failed_at': fields.Datetime.now()}
+            for _attempt in range(count)
+        ])
+
+    def test_ip_limit_spares_clean_accounts(self):
+        # The office NAT is flooded, but this account has no failures of its own
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.ip_failure_limit', 3)
+        self._fail_from_office(3)
+        self.assertIn(self._login('right').status_code, (302, 303))
+
+    def test_ip_limit_blocks_failing_accounts(self):
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.ip_failure_limit', 3)
+        self._login('wrong')
+        self._fail_from_office(3)
+        self.assertEqual(self._login('right').status_code, 429)
+
+    def test_busy(self):
+        self.env['ir.config_parameter'].sudo().set_param('attendance_dashboard.max_concurrent_logins', 0)
+        response = self._login('right')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], str(RETRY_AFTER_BUSY))
@@ -0,0 +1,147 @@
+from odoo import models, fields
+from odoo.exceptions import UserError
+import base64
+import csv
+import io
+import logging
+import secrets
+
+_logger = logging.getLogger(__name__)
+
+# Logins are inserted this many at a time
+PROVISION_BATCH_SIZE = 500
+
+RESULT_HEADER = ['Employee ID', 'Employee', 'Password', 'Activation Link', 'Link Expiry']
+
+
+class EmployeeLoginProvision(models.TransientModel):
+    """
+    Creates ``employee.login`` accounts for many employees at once, instead of
+    each one registering on first login.
+
+    Employees come from the selection or from a CSV file with an
+    ``employee_number`` column and an optional ``password`` column, ignored
+    for activation links. Passwords
+    are hashed in a process pool, then the logins are inserted in batches; the
+    generated credentials are returned as a CSV to hand out.
+
+    An activation link carries a single-use token: the employee opens it once,
+    before it expires, to choose their own password.
+    """
+    _name = 'employee.login.provision'
+    _description = 'Provision Employee Logins'
+
+    def _default_employee_ids(self):
+        if self.env.context.get('active_model') == 'hr.employee':
+            return [(6, 0, self.env.context.get('active_ids', []))]
+        return False
+
+    employee_ids = fields.Many2many('hr.employee', string='Employees', default=_default_employee_ids)
+    csv_file = fields.Binary(string='CSV File')
+    csv_filename = fields.Char(string='CSV File Name')
+    credential_type = fields.Selection([
+        ('password', 'Initial Password'),
+        ('activation', 'Activation Link'),
+    ], string='Credentials', required=True, default='password',
+        help="Activation Link: each employee gets a single-use link, valid for a few days, "
+             "to choose their own password.")
+    password = fields.Char(
+        string='Initial Password',
+        help="Shared initial password. Leave empty to generate one per employee.")
+    state = fields.Selection([('draft', 'Draft'), ('done', 'Done')], default='draft')
+    created_count = fields.Integer(string='Created', readonly=True)
+    skipped_count = fields.Integer(string='Already Registered', readonly=True)
+    result_file = fields.Binary(string='Credentials', readonly=True)
+    result_filename = fields.Char(readonly=True)
+
+    def _read_csv(self):
+        """Return ``{employee_number: password or None}`` from the uploaded file."""
+        try:
+            content = base64.b64decode(self.csv_file).decode('utf-8-sig')
+        except (ValueError, UnicodeDecodeError):
+            raise UserError("The file must be a UTF-8 encoded CSV.")
+        reader = csv.DictReader(io.StringIO(content))
+        if 'employee_number' not in (reader.fieldnames or []):
+            raise UserError("The CSV file needs an 'employee_number' column.")
+        rows = {}
+        for row in reader:
+            number = (row.get('employee_number') or '').strip()
+            if number:
+                rows[number] = (row.get('password') or '').strip() or None
+        return rows
+
+    def _get_requested_credentials(self):
+        """Return ``[(employee, raw password or None)]`` for the selection and the file."""
+        passwords = {employee.id: None for employee in self.employee_ids}
+        employees = self.employee_ids
+        if self.csv_file:
+            rows = self._read_csv()
+            found = self.env['hr.employee'].search([('employee_number', 'in', list(rows))])
+            missing = set(rows) - set(found.mapped('employee_number'))
+            if missing:
+                raise UserError("Unknown employee IDs in the file: %s" % ', '.join(sorted(missing)))
+            for employee in found:
+                passwords[employee.id] = rows[employee.employee_number]
+            employees |= found
+        if not employees:
+            raise UserError("Select employees or upload a CSV file.")
+        return [(employee, passwords[employee.id]) for employee in employees]
+
+    def action_provision(self):
+        self.ensure_one()
+        Login = self.env['employee.login'].sudo()
+        requested = self._get_requested_credentials()
+        registered = set(Login.search(
+            [('employee_number', 'in', [employee.id for employee, _password in requested])]
+        ).mapped('employee_number').ids)
+        pending = [(employee, password) for employee, password in requested if employee.id not in registered]
+
+        # Logins waiting for activation still need a password: a random one
+        # nobody is given, whatever the file says
+        raw_passwords, generated = [], []
+        for _employee, password in pending:
+            if self.credential_type == 'password':
+                password = password or self.password
+                generated.append(not password)
+            else:
+                password = None
+                generated.append(False)
+            raw_passwords.append(password or secrets.token_urlsafe(9))
+        hashed = Login._hash_passwords(raw_passwords)
+
+        with_activation = self.credential_type == 'activation'
+        activate_url = self.get_base_url() + '/employee/activate?token='
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(RESULT_HEADER)
+        for offset in range(0, len(pending), PROVISION_BATCH_SIZE):
+            batch = pending[offset:offset + PROVISION_BATCH_SIZE]
+            logins = Login._create_hashed([
+                dict(employee_number=employee.id, password=password_hash,
+                     **(Login._new_activation_vals() if with_activation else {}))
+                for (employee, _password), password_hash in zip(batch, hashed[offset:offset + PROVISION_BATCH_SIZE])
+            ])
+            for index, ((employee, _password), login) in enumerate(zip(batch, logins), start=offset):
+                writer.writerow([
+                    employee.employee_number or '',
+                    employee.name,
+                    raw_passwords[index] if generated[index] else '',
+                    activate_url + login.activation_token if with_activation else '',
+                    fields.Datetime.to_string(login.activation_expiry) if with_activation else '',
+                ])
+        _logger.info("Provisioned %s employee logins (%s already registered)", len(pending), len(registered))
+
+        self.write({
+            'state': 'done',
+            'created_count': len(pending),
+            'skipped_count': len(registered),
+            'result_file': base64.b64encode(output.getvalue().encode('utf-8')),
+            'result_filename': 'employee_credentials.csv',
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }